@@ -14,146 +14,31 @@ import streamlit as st
 import json
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, TYPE_CHECKING
 import os
-from utils.provider_switcher import ProviderSwitcher
+import time
+import hashlib
 from utils.context_retriever import ContextRetriever
+from utils.i18n import t
+from utils.styling import inject_css
+from utils.briefing_helpers import (
+    RESULT_FIELDS,
+    parse_articles_from_markdown,
+    briefing_sort_key,
+    split_markdown_blocks,
+    build_article_index,
+    search_articles_local,
+    select_relevant_articles,
+    create_enriched_briefing_context,
+    render_article_card_html,
+    format_multi_week_results,
+    throttle_stream,
+    SEARCH_SYSTEM_PROMPT,
+    ANSWER_SYSTEM_PROMPT,
+)
 
-# ============================================================================
-# TRANSLATIONS - UI TEXT IN ENGLISH AND MANDARIN CHINESE
-# ============================================================================
-
-TRANSLATIONS = {
-    "page_title": {
-        "en": "AI Industry Weekly Briefing",
-        "zh": "AI行业周报"
-    },
-    "subtitle": {
-        "en": "Executive Summary & Insights",
-        "zh": "高管摘要与洞察"
-    },
-    "mode_search": {
-        "en": "Search",
-        "zh": "搜索"
-    },
-    "mode_ask": {
-        "en": "Ask Question",
-        "zh": "提问"
-    },
-    "unified_input_search": {
-        "en": "Search articles...",
-        "zh": "搜索文章..."
-    },
-    "unified_input_ask": {
-        "en": "Ask a question about the briefing...",
-        "zh": "提问关于简报..."
-    },
-    "search_help": {
-        "en": "Company/Model/Topic search powered by LLM",
-        "zh": "由LLM驱动的公司/模型/主题搜索"
-    },
-    "about_brief": {
-        "en": "ℹ️ About This Brief",
-        "zh": "ℹ️ 关于此简报"
-    },
-    "about_description": {
-        "en": "This briefing features the top 10 AI industry articles this week, selected by impact and novelty.",
-        "zh": "此简报展示本周按影响和新颖性选择的前10篇AI行业文章。"
-    },
-    "report_date": {
-        "en": "Report Date",
-        "zh": "报告日期"
-    },
-    "last_updated": {
-        "en": "Last Updated",
-        "zh": "最后更新"
-    },
-    "articles": {
-        "en": "Articles",
-        "zh": "文章"
-    },
-    "executive_summary": {
-        "en": "📊 Executive Summary",
-        "zh": "📊 高管摘要"
-    },
-    "language": {
-        "en": "🌐 Language",
-        "zh": "🌐 语言"
-    },
-    "download": {
-        "en": "⬇️ Download as Markdown",
-        "zh": "⬇️ 下载Markdown"
-    },
-    "briefing": {
-        "en": "Briefing",
-        "zh": "简报"
-    },
-    "download_tab": {
-        "en": "Download",
-        "zh": "下载"
-    },
-    "chat_error": {
-        "en": "Error answering question",
-        "zh": "回答问题时出错"
-    },
-    "search_results_title": {
-        "en": "📄 Search Results",
-        "zh": "📄 搜索结果"
-    },
-    "no_results": {
-        "en": "No articles matched your search",
-        "zh": "没有文章与您的搜索匹配"
-    },
-    "ai_response": {
-        "en": "💬 AI Response",
-        "zh": "💬 AI回复"
-    },
-    "your_question": {
-        "en": "You",
-        "zh": "你"
-    },
-    "ai_assistant": {
-        "en": "Assistant",
-        "zh": "助手"
-    },
-    "multi_week_search": {
-        "en": "Multi-Week Search",
-        "zh": "多周搜索"
-    },
-    "entity_search": {
-        "en": "Entity Search",
-        "zh": "实体搜索"
-    },
-    "date_range": {
-        "en": "Date Range",
-        "zh": "日期范围"
-    },
-    "entity_type": {
-        "en": "Entity Type",
-        "zh": "实体类型"
-    },
-    "companies": {
-        "en": "Companies/Models",
-        "zh": "公司/模型"
-    },
-    "people": {
-        "en": "People",
-        "zh": "人物"
-    },
-    "locations": {
-        "en": "Locations",
-        "zh": "地点"
-    },
-    "other": {
-        "en": "Other",
-        "zh": "其他"
-    },
-}
-
-def t(key: str, lang: str = "en", **kwargs) -> str:
-    """Get translated text"""
-    text = TRANSLATIONS.get(key, {}).get(lang, TRANSLATIONS.get(key, {}).get("en", key))
-    return text.format(**kwargs) if kwargs else text
+if TYPE_CHECKING:
+    from utils.provider_switcher import ProviderSwitcher
 
 # ============================================================================
 # PAGE CONFIGURATION
@@ -179,202 +64,44 @@ if "search_results" not in st.session_state:
     st.session_state.search_results = None
 if "selected_briefing" not in st.session_state:
     st.session_state.selected_briefing = None
-if "provider_switcher" not in st.session_state:
-    try:
-        st.session_state.provider_switcher = ProviderSwitcher()
-    except Exception as e:
-        st.error(f"Failed to initialize LLM provider: {e}")
-        st.session_state.provider_switcher = None
+
+@st.cache_resource(show_spinner=False)
+def get_provider_switcher() -> "ProviderSwitcher":
+    """
+    Process-wide ProviderSwitcher shared by all sessions and reruns
+
+    Imported and created on the first LLM call, so the OpenAI SDK import
+    does not delay the first page render. Failures are not cached, so a
+    broken config is retried on the next call.
+    """
+    from utils.provider_switcher import ProviderSwitcher
+    return ProviderSwitcher()
 
 # ============================================================================
 # CUSTOM STYLING
 # ============================================================================
 
-st.markdown("""
-    <style>
-    .main-title {
-        font-size: 2.5em;
-        font-weight: bold;
-        margin-bottom: 0.3em;
-        color: #1f77b4;
-    }
-    .subtitle-text {
-        font-size: 1.1em;
-        color: #555;
-        margin-bottom: 1em;
-    }
-    .article-card {
-        background-color: #f0f2f6;
-        padding: 1.2em;
-        border-radius: 0.5em;
-        margin: 0.8em 0;
-        border-left: 4px solid #1f77b4;
-    }
-    .article-title {
-        font-size: 1.1em;
-        font-weight: bold;
-        color: #1f77b4;
-        margin-bottom: 0.5em;
-    }
-    .article-meta {
-        font-size: 0.85em;
-        color: #666;
-        margin-bottom: 0.5em;
-    }
-    .article-summary {
-        font-size: 0.95em;
-        line-height: 1.5;
-        color: #333;
-    }
-    .article-url {
-        font-size: 0.85em;
-        color: #1f77b4;
-        text-decoration: none;
-    }
-    .chat-message {
-        padding: 1em;
-        border-radius: 0.5em;
-        margin: 0.8em 0;
-    }
-    .chat-user {
-        background-color: #e8f4f8;
-        margin-left: 1em;
-    }
-    .chat-ai {
-        background-color: #f0f0f0;
-        margin-right: 1em;
-    }
-    .mode-selector {
-        margin: 1em 0;
-        padding: 1em;
-        background-color: #f9f9f9;
-        border-radius: 0.5em;
-    }
-    .search-result-item {
-        background-color: #fafafa;
-        padding: 1em;
-        margin: 0.5em 0;
-        border-left: 3px solid #1f77b4;
-        border-radius: 0.3em;
-    }
-    .relevance-score {
-        display: inline-block;
-        background-color: #1f77b4;
-        color: white;
-        padding: 0.2em 0.5em;
-        border-radius: 0.25em;
-        font-size: 0.85em;
-        margin-top: 0.5em;
-    }
-    </style>
-""", unsafe_allow_html=True)
+inject_css()
 
 # ============================================================================
 # LOAD BRIEFING DATA
 # ============================================================================
 
-def parse_articles_from_markdown(content: str) -> List[Dict[str, str]]:
-    """Parse articles from markdown briefing content"""
-    articles = []
-    lines = content.split('\n')
-    i = 0
-
-    while i < len(lines):
-        line = lines[i]
-        # Look for article titles (numbered like "**1. Title**" or "**1. AI投资分析系统")
-        if line.startswith('**') and line[2].isdigit() and '. ' in line:
-            # Extract title - remove asterisks and number prefix
-            title_raw = line.strip('*').strip()
-            # Remove the number and dot prefix (e.g., "1. " or "10. ")
-            if '. ' in title_raw:
-                title = title_raw.split('. ', 1)[1]
-            else:
-                title = title_raw
-
-            summary = ""
-            url = ""
-            source = ""
-
-            i += 1
-            # Collect lines until we hit next article or end
-            while i < len(lines):
-                current_line = lines[i].strip()
-
-                # Stop if we hit the next article
-                if current_line.startswith('**') and len(current_line) > 2 and current_line[2].isdigit():
-                    break
-
-                # Extract source - look for "**来源**: value" or "**来源**:" patterns
-                if '**来源**' in current_line and ':' in current_line:
-                    # Extract everything after the colon
-                    source = current_line.split(':', 1)[1].strip()
-                elif current_line.startswith('**来源'):
-                    # Fallback pattern
-                    parts = current_line.split(':', 1)
-                    if len(parts) > 1:
-                        source = parts[1].strip()
-
-                # Extract URL - look for "**URL**: value" patterns
-                elif '**URL**' in current_line and ':' in current_line:
-                    url = current_line.split(':', 1)[1].strip()
-                elif 'URL:' in current_line:
-                    url = current_line.split(':', 1)[1].strip()
-
-                # First non-empty non-metadata line is the summary
-                elif summary == "" and current_line and not current_line.startswith('**'):
-                    summary = current_line
-
-                i += 1
-
-            if title.strip():
-                articles.append({
-                    "title": title.strip(),
-                    "summary": summary[:200] if summary else "无摘要",
-                    "url": url if url else "",
-                    "source": source if source else ""
-                })
-            continue
-
-        i += 1
-
-    return articles
-
-def create_enriched_briefing_context(articles: List[Dict[str, str]]) -> str:
-    """
-    Create enriched context for LLM with full article information
-    Includes article summaries, sources, URLs, and explanations
-    """
-    if not articles:
-        return "No articles available."
-
-    context_lines = []
-    context_lines.append("# 本周精选文章\n")
-
-    for idx, article in enumerate(articles, 1):
-        context_lines.append(f"## {idx}. {article.get('title', 'Untitled')}")
-        context_lines.append("")
-
-        if article.get('summary'):
-            context_lines.append(article['summary'])
-            context_lines.append("")
-
-        if article.get('source') or article.get('url'):
-            meta_parts = []
-            if article.get('source'):
-                meta_parts.append(f"来源: {article['source']}")
-            if article.get('url'):
-                meta_parts.append(f"URL: {article['url']}")
-            context_lines.append(" | ".join(meta_parts))
-            context_lines.append("")
-
-    context_lines.append("\n---\n")
-    context_lines.append("使用说明:")
-    context_lines.append("- 分析文章时，请参考完整内容")
-    context_lines.append("- 找出每篇文章的中心论点（central argument）")
-    context_lines.append("- 指出支撑论点的数据和证据（data and evidence）")
-    context_lines.append("- 如果用户要求，可以从URL获取完整文章进行更深入分析")
-
-    return "\n".join(context_lines)
+@st.cache_data(show_spinner=False)
+def cached_markdown_blocks(content: str) -> List[str]:
+    """Memoized split_markdown_blocks for repeated result text"""
+    return split_markdown_blocks(content)
+
+def render_markdown_blocks(content: str) -> None:
+    """Render markdown block by block (see split_markdown_blocks)"""
+    for block in cached_markdown_blocks(content):
+        st.markdown(block)
+
+
+@st.cache_resource(show_spinner=False)
+def get_context_retriever() -> ContextRetriever:
+    """Shared ContextRetriever so its per-report search index survives reruns"""
+    return ContextRetriever()
 
 def search_multi_week_with_context_retriever(
     keyword: str,
@@ -393,12 +120,13 @@ def search_multi_week_with_context_retriever(
         List of matching articles with report metadata
     """
     try:
-        retriever = ContextRetriever()
+        retriever = get_context_retriever()
         results = retriever.search_by_keyword(
             keyword=keyword,
             date_from=date_from,
             date_to=date_to,
-            search_fields=["title", "full_content"]
+            search_fields=["title", "full_content"],
+            fields=RESULT_FIELDS
         )
         return results
     except Exception as e:
@@ -424,99 +152,53 @@ def search_by_entity_with_context_retriever(
         List of articles mentioning the entity with report metadata
     """
     try:
-        retriever = ContextRetriever()
+        retriever = get_context_retriever()
         results = retriever.search_by_entity(
             entity_name=entity_name,
             entity_type=entity_type,
             date_from=date_from,
-            date_to=date_to
+            date_to=date_to,
+            fields=RESULT_FIELDS
         )
         return results
     except Exception as e:
         return []
 
-def format_multi_week_results(results: List[Dict[str, Any]], lang: str = "zh") -> str:
-    """
-    Format multi-week search results for display
-
-    Args:
-        results: List of articles from ContextRetriever
-        lang: Language for display (zh/en)
-
-    Returns:
-        Formatted markdown string
-    """
-    if not results:
-        return "没有找到匹配的文章。" if lang == "zh" else "No articles found."
-
-    output_lines = []
-    output_lines.append(f"## 找到 {len(results)} 篇相关文章\n" if lang == "zh" else f"## Found {len(results)} relevant articles\n")
-
-    # Group by date
-    by_date = {}
-    for article in results:
-        date = article.get("report_date", "Unknown")
-        if date not in by_date:
-            by_date[date] = []
-        by_date[date].append(article)
-
-    # Display grouped by date
-    for date in sorted(by_date.keys(), reverse=True):
-        output_lines.append(f"### 📅 {date}")
-        output_lines.append("")
-
-        for article in by_date[date]:
-            output_lines.append(f"**{article.get('title', 'Untitled')}**")
-
-            meta_parts = []
-            if article.get('source'):
-                meta_parts.append(f"来源: {article['source']}" if lang == "zh" else f"Source: {article['source']}")
-            if article.get('url'):
-                meta_parts.append(f"[URL]({article['url']})")
-
-            if meta_parts:
-                output_lines.append(" | ".join(meta_parts))
-
-            if article.get('credibility_score'):
-                score = article.get('credibility_score')
-                output_lines.append(f"可信度: {score}/10" if lang == "zh" else f"Credibility: {score}/10")
-
-            output_lines.append("")
-
-    return "\n".join(output_lines)
-
 def load_latest_briefing() -> Optional[Dict[str, Any]]:
     """Load the latest briefing from data/reports directory"""
     reports_dir = Path("./data/reports")
     if not reports_dir.exists():
         return None
 
-    # Look for both briefing_*.md and ai_briefing_*.md patterns
-    markdown_files = sorted(reports_dir.glob("*briefing_*.md"), reverse=True)
-    if not markdown_files:
+    # Look for both briefing_*.md and ai_briefing_*.md patterns (listing cached per directory mtime)
+    briefings = get_available_briefings()
+    if not briefings:
         return None
+    latest_file = briefings[0]["path"]
 
-    latest_file = markdown_files[0]
-
-    # Try to find corresponding JSON file
-    json_file = reports_dir / latest_file.stem / "data.json"
+    # Nothing writes a data.json next to the reports, so the markdown is the source
+    return parse_briefing_file(str(latest_file), latest_file.stat().st_mtime_ns)
 
-    # If JSON doesn't exist, look for data.json
-    data_files = list(reports_dir.glob("**/data.json"))
-    if data_files:
-        with open(data_files[0], 'r', encoding='utf-8') as f:
-            return json.load(f)
+@st.cache_data(show_spinner=False, max_entries=64)
+def parse_briefing_file(path_str: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Read a briefing markdown file and parse its articles
 
-    # Load markdown and parse articles
-    content = latest_file.read_text(encoding='utf-8')
+    mtime_ns is only part of the cache key: each file version is parsed
+    once and shared across sessions and reruns. Superseded versions are
+    evicted once more than max_entries are cached.
+    """
+    briefing_file = Path(path_str)
+    content = briefing_file.read_text(encoding='utf-8')
     articles = parse_articles_from_markdown(content)
-
-    # Fallback: create structure from markdown
     return {
-        "date": latest_file.stem.replace("ai_briefing_", "").replace("briefing_", ""),
+        "date": briefing_file.stem.replace("ai_briefing_", "").replace("briefing_", ""),
         "title": "AI Industry Weekly Briefing",
         "content": content,
-        "articles": articles
+        "articles": articles,
+        "search_index": build_article_index(articles),
+        "context": create_enriched_briefing_context(articles),
+        "last_updated": datetime.fromtimestamp(mtime_ns / 1e9).strftime('%Y-%m-%d %H:%M:%S')
     }
 
 def get_available_briefings() -> List[Dict[str, Any]]:
@@ -525,8 +207,19 @@ def get_available_briefings() -> List[Dict[str, Any]]:
     if not reports_dir.exists():
         return []
 
+    # Directory mtime changes whenever a report is added, removed or renamed
+    return list_briefings(str(reports_dir), reports_dir.stat().st_mtime_ns)
+
+@st.cache_data(show_spinner=False)
+def list_briefings(reports_dir_str: str, dir_mtime_ns: int) -> List[Dict[str, Any]]:
+    """List briefing markdown files, newest date first (cached per directory mtime)"""
+    reports_dir = Path(reports_dir_str)
     briefings = []
-    markdown_files = sorted(reports_dir.glob("*briefing_*.md"), reverse=True)
+    markdown_files = sorted(
+        reports_dir.glob("*briefing_*.md"),
+        key=lambda path: briefing_sort_key(path.stem),
+        reverse=True
+    )
 
     for file in markdown_files:
         date_str = file.stem.replace("ai_briefing_", "").replace("briefing_", "")
@@ -538,82 +231,191 @@ def get_available_briefings() -> List[Dict[str, Any]]:
 
     return briefings
 
-def search_articles_with_llm(query: str, briefing_content: str, lang: str = "en") -> str:
-    """Use LLM to search and return matching articles with detailed analysis"""
-    if not st.session_state.provider_switcher:
-        return t("chat_error", lang)
+def load_selected_briefing(briefing_file: Path) -> Dict[str, Any]:
+    """
+    Load an archived briefing
+
+    The parsed result is kept in session_state keyed on (path, mtime), so
+    reruns that keep the same selection skip even the st.cache_data lookup
+    in parse_briefing_file and only pay for a stat() call.
+    """
+    key = (str(briefing_file), briefing_file.stat().st_mtime_ns)
+    cached = st.session_state.get("briefing_memo")
+    if cached and cached[0] == key:
+        return cached[1]
+
+    briefing = parse_briefing_file(*key)
+    st.session_state.briefing_memo = (key, briefing)
+    return briefing
+
+# Ask-mode messages kept in session_state (user + assistant per turn)
+CHAT_HISTORY_MAX_MESSAGES = 20
+
+# Articles sent in full to the LLM when the local index finds matches
+CONTEXT_TOP_K = 3
+
+# LLM responses are reused for an hour; oldest entries are evicted past the cap
+LLM_CACHE_TTL = 3600
+LLM_CACHE_MAX_ENTRIES = 256
+
+@st.cache_resource(show_spinner=False)
+def get_llm_response_cache() -> Dict[tuple, tuple]:
+    """Process-wide LLM response cache: key -> (stored_at, text)"""
+    return {}
+
+def llm_cache_key(mode: str, query: str, context: str, lang: str) -> tuple:
+    """
+    Cache key for an LLM response: (mode, stripped query, context digest, lang)
+
+    Only the context string is hashed. Callers pass the per-query context
+    from build_query_context, which is a function of the briefing and the
+    query, so the top-k focus is covered by the query in the key.
+    """
+    context_hash = hashlib.blake2b(context.encode("utf-8"), digest_size=8).hexdigest()
+    return (mode, query.strip(), context_hash, lang)
+
+def get_cached_response(key: tuple) -> Optional[str]:
+    """Return a cached LLM response if it has not expired"""
+    entry = get_llm_response_cache().get(key)
+    if entry and time.time() - entry[0] < LLM_CACHE_TTL:
+        return entry[1]
+    return None
+
+def put_cached_response(key: tuple, text: str) -> None:
+    """Store a successful LLM response"""
+    cache = get_llm_response_cache()
+    cache.pop(key, None)
+    cache[key] = (time.time(), text)
+    while len(cache) > LLM_CACHE_MAX_ENTRIES:
+        cache.pop(next(iter(cache)), None)
+
+def build_query_context(briefing: Dict[str, Any], query: str) -> str:
+    """
+    Build the LLM context for a query over a briefing
+
+    Uses the top-k locally matching articles; when there is no clear match
+    (including broad questions about the whole briefing), reuses the full
+    context precomputed by parse_briefing_file.
+    """
+    articles = briefing.get("articles", [])
+    index = briefing.get("search_index")
+    if index is None:
+        index = build_article_index(articles)
+
+    focus = select_relevant_articles(query, index, k=CONTEXT_TOP_K)
+    if focus is None and "context" in briefing:
+        return briefing["context"]
+    return create_enriched_briefing_context(articles, focus=focus)
+
+def search_articles_with_llm(query: str, briefing_content: str, lang: str = "en") -> Iterator[str]:
+    """
+    Use LLM to search and return matching articles with detailed analysis
+
+    Streams and caches like answer_question_about_briefing; provider errors
+    propagate to the caller.
+    """
+    cache_key = llm_cache_key("search", query, briefing_content, lang)
+    cached = get_cached_response(cache_key)
+    if cached is not None:
+        yield cached
+        return
 
     try:
-        system_prompt = f"""你是一位AI行业搜索专家。用户需要找到与其查询相关的文章。
-
-搜索要求:
-1. 找到所有与用户查询相关的文章
-2. 对每篇匹配的文章进行详细分析
-3. 说明为什么这篇文章与查询相关
-4. 提供具体的证据或摘录支持您的判断
-
-返回格式（对每篇匹配的文章）:
-**[文章标题]**
-来源: [来源]
-URL: [链接]
-相关度: [高/中/低]
-相关原因: [简要说明这篇文章为什么与查询相关，包括具体的数据或证据]
-
-重要提示:
-- 如果找不到相关文章，明确说明
-- 不要编造不存在的文章
-- 使用中文回答
-- 深入分析而不仅仅返回标题
-
-以下是本周的文章内容:
-
-{briefing_content}"""
-
-        response = st.session_state.provider_switcher.query(
-            prompt=f"根据以下查询搜索文章: {query}",
-            system_prompt=system_prompt,
-            max_tokens=1024,
-            temperature=0.7
-        )
-        return response
+        provider_switcher = get_provider_switcher()
     except Exception as e:
-        return f"{t('chat_error', lang)}: {str(e)}"
+        raise RuntimeError(f"Failed to initialize LLM provider: {e}") from e
+
+    system_prompt = SEARCH_SYSTEM_PROMPT + briefing_content
 
-def answer_question_about_briefing(question: str, briefing_content: str, lang: str = "en") -> str:
-    """Use LLM to answer questions about the briefing with deep analysis"""
-    if not st.session_state.provider_switcher:
-        return t("chat_error", lang)
+    chunks = []
+    for chunk in provider_switcher.query_stream(
+        prompt=f"根据以下查询搜索文章: {query}",
+        system_prompt=system_prompt,
+        max_tokens=1024,
+        temperature=0.7
+    ):
+        chunks.append(chunk)
+        yield chunk
+
+    if chunks:
+        put_cached_response(cache_key, "".join(chunks))
+
+def answer_question_about_briefing(question: str, briefing_content: str, lang: str = "en") -> Iterator[str]:
+    """
+    Use LLM to answer questions about the briefing with deep analysis
+
+    Streams the answer as text chunks; provider errors propagate to the caller.
+    A cached answer is yielded as a single chunk; fresh answers are cached
+    only once the stream completes.
+    """
+    cache_key = llm_cache_key("ask", question, briefing_content, lang)
+    cached = get_cached_response(cache_key)
+    if cached is not None:
+        yield cached
+        return
 
     try:
-        system_prompt = f"""你是一位AI行业分析专家。你需要回答关于AI行业周报的问题。
-
-关键职责:
-1. 分析文章内容，提取中心论点（Central Argument）
-2. 识别并解释支撑论点的数据和证据（Data and Evidence）
-3. 如果用户提问含混，应该提供多角度的分析
-4. 引用具体的文章标题和来源
-5. 深入分析而非仅重复摘要
-
-回答要求:
-- 准确引用文章内容
-- 提供具体的数据、数字或事实
-- 解释因果关系和逻辑
-- 必要时可以从多篇文章综合分析
-- 使用中文回答，保持专业且易懂的语气
-
-以下是本周的文章内容:
-
-{briefing_content}"""
-
-        response = st.session_state.provider_switcher.query(
-            prompt=question,
-            system_prompt=system_prompt,
-            max_tokens=1024,
-            temperature=0.7
-        )
-        return response
+        provider_switcher = get_provider_switcher()
     except Exception as e:
-        return f"{t('chat_error', lang)}: {str(e)}"
+        raise RuntimeError(f"Failed to initialize LLM provider: {e}") from e
+
+    system_prompt = ANSWER_SYSTEM_PROMPT + briefing_content
+
+    chunks = []
+    for chunk in provider_switcher.query_stream(
+        prompt=question,
+        system_prompt=system_prompt,
+        max_tokens=1024,
+        temperature=0.7
+    ):
+        chunks.append(chunk)
+        yield chunk
+
+    if chunks:
+        put_cached_response(cache_key, "".join(chunks))
+
+def render_article_cards(numbered_articles) -> str:
+    """
+    Join the cards for (number, article) pairs into one HTML string
+
+    Emitting a whole list through a single st.html call creates one
+    element instead of one per article.
+    """
+    return "".join(
+        render_article_card_html(
+            idx,
+            article.get('title', 'Untitled'),
+            article.get('summary', ''),
+            article.get('source', ''),
+            article.get('url', '')
+        )
+        for idx, article in numbered_articles
+    )
+
+# Article cards rendered per page in the briefing column
+ARTICLES_PER_PAGE = 5
+
+@st.fragment
+def render_article_pages(articles: List[Dict[str, str]], briefing_date: str, lang: str) -> None:
+    """
+    Render one page of article cards with a page selector
+
+    Runs as a fragment, so changing page reruns only this list instead of
+    the whole script. Only the current page of cards is sent per rerun.
+    """
+    page_count = (len(articles) + ARTICLES_PER_PAGE - 1) // ARTICLES_PER_PAGE
+    page = 0
+    if page_count > 1:
+        page = st.selectbox(
+            t('page', lang),
+            range(page_count),
+            format_func=lambda p: f"{p + 1} / {page_count}",
+            key=f"article_page_{briefing_date}"
+        )
+    start = page * ARTICLES_PER_PAGE
+
+    page_articles = articles[start:start + ARTICLES_PER_PAGE]
+    st.html(render_article_cards(enumerate(page_articles, start + 1)))
 
 # ============================================================================
 # MAIN APP LAYOUT
@@ -635,6 +437,9 @@ with col_lang:
         label_visibility="collapsed"
     )
 
+# Archive entries offered in the sidebar selectbox; older ones via the filter
+ARCHIVE_MAX_OPTIONS = 50
+
 # Archive section in sidebar
 with st.sidebar:
     st.markdown("### 📚 Archive / 存档")
@@ -642,28 +447,36 @@ with st.sidebar:
 
     if available:
         briefing_options = {b['date']: b['path'] for b in available}
-        selected_date = st.selectbox(
-            "Select briefing / 选择简报",
-            options=list(briefing_options.keys()),
-            index=0,
-            label_visibility="collapsed"
-        )
-
-        if selected_date:
+        # list_briefings orders by the date in the filename, so the cap keeps the newest
+        dates = list(briefing_options)
+        # Keep the selectbox bounded as the archive grows
+        if len(dates) > ARCHIVE_MAX_OPTIONS:
+            date_filter = st.text_input(
+                "Filter / 筛选",
+                placeholder="e.g. 202601 / 例如：202601",
+                key="archive_filter",
+                label_visibility="collapsed"
+            )
+            if date_filter:
+                dates = [d for d in dates if date_filter in d]
+            dates = dates[:ARCHIVE_MAX_OPTIONS]
+
+        if dates:
+            selected_date = st.selectbox(
+                "Select briefing / 选择简报",
+                options=dates,
+                index=0,
+                label_visibility="collapsed"
+            )
             st.session_state.selected_briefing = briefing_options[selected_date]
+        else:
+            # Don't keep showing a briefing the filter no longer lists
+            st.info("No matching briefings / 没有匹配的简报")
+            st.session_state.selected_briefing = None
 
 # Load briefing data - either from archive selection or latest
 if st.session_state.selected_briefing:
-    briefing_file = st.session_state.selected_briefing
-    content = briefing_file.read_text(encoding='utf-8')
-    articles = parse_articles_from_markdown(content)
-    date_str = briefing_file.stem.replace("ai_briefing_", "").replace("briefing_", "")
-    briefing = {
-        "date": date_str,
-        "title": "AI Industry Weekly Briefing",
-        "content": content,
-        "articles": articles
-    }
+    briefing = load_selected_briefing(st.session_state.selected_briefing)
 else:
     briefing = load_latest_briefing()
 
@@ -698,25 +511,7 @@ with left_col:
     st.markdown(f"**{t('articles', st.session_state.language)}**")
 
     if briefing.get("articles"):
-        for idx, article in enumerate(briefing["articles"], 1):
-            # Article title
-            st.markdown(f"**{idx}. {article.get('title', 'Untitled')}**")
-
-            # Article summary
-            if article.get('summary'):
-                st.markdown(article['summary'])
-
-            # Source and URL in one line
-            meta_info = []
-            if article.get('source'):
-                meta_info.append(f"来源: {article['source']}")
-            if article.get('url'):
-                meta_info.append(f"[{article['url']}]({article['url']})")
-
-            if meta_info:
-                st.caption(" | ".join(meta_info))
-
-            st.divider()
+        render_article_pages(briefing["articles"], briefing["date"], st.session_state.language)
     else:
         st.info("No articles in this briefing")
 
@@ -735,11 +530,17 @@ with left_col:
 # ============================================================================
 # RIGHT COLUMN: UNIFIED CHAT+SEARCH INTERFACE
 # ============================================================================
-with right_col:
+@st.fragment
+def render_assistant(briefing: Dict[str, Any]) -> None:
+    """
+    Right-column assistant: mode selector, search inputs and results
+
+    Runs as a fragment, so submitting a search or question reruns only this
+    column instead of reloading and re-rendering the briefing on the left.
+    """
     st.markdown("### 🤖 AI Assistant")
 
     # Mode selector with support for three search types + ask
-    st.markdown(f"<div class='mode-selector'>", unsafe_allow_html=True)
     mode_options = {
         "this_week": t('mode_search', st.session_state.language),
         "multi_week": t('multi_week_search', st.session_state.language),
@@ -755,99 +556,119 @@ with right_col:
         label_visibility="collapsed",
         key="mode_selector"
     )
-    st.markdown(f"</div>", unsafe_allow_html=True)
 
     # Additional inputs based on selected mode
     user_input = None
     search_params = {}
 
     if st.session_state.current_mode == "this_week":
-        user_input = st.text_input(
-            "Search / 搜索",
-            placeholder=t('unified_input_search', st.session_state.language),
-            key="search_input",
-            label_visibility="collapsed"
-        )
+        # Form: searches (and LLM calls) run only on an explicit submit, not
+        # on every rerun while the old query is still in the box
+        with st.form("this_week_search_form", border=False):
+            query = st.text_input(
+                "Search / 搜索",
+                placeholder=t('unified_input_search', st.session_state.language),
+                key="search_input",
+                label_visibility="collapsed"
+            )
+            deep_analysis = st.toggle(t('deep_analysis', st.session_state.language), key="deep_analysis")
+            if st.form_submit_button(t('mode_search', st.session_state.language)):
+                user_input = query
         st.caption(t('search_help', st.session_state.language))
 
     elif st.session_state.current_mode == "multi_week":
-        col1, col2 = st.columns(2)
-        with col1:
-            # Default to last 4 weeks
-            default_from = datetime.now() - timedelta(days=28)
-            date_from = st.date_input(
-                f"{t('date_range', st.session_state.language)} - {t('mode_search', st.session_state.language).split()[0]}",
-                value=default_from,
-                key="date_from",
-                label_visibility="collapsed"
-            )
-        with col2:
-            date_to = st.date_input(
-                f"{t('date_range', st.session_state.language)} - {t('mode_ask', st.session_state.language)}",
-                value=datetime.now(),
-                key="date_to",
+        # Form: widget edits only trigger a search on submit
+        with st.form("multi_week_search_form", border=False):
+            col1, col2 = st.columns(2)
+            with col1:
+                # Default to last 4 weeks
+                default_from = datetime.now() - timedelta(days=28)
+                date_from = st.date_input(
+                    f"{t('date_range', st.session_state.language)} - {t('mode_search', st.session_state.language).split()[0]}",
+                    value=default_from,
+                    key="date_from",
+                    label_visibility="collapsed"
+                )
+            with col2:
+                date_to = st.date_input(
+                    f"{t('date_range', st.session_state.language)} - {t('mode_ask', st.session_state.language)}",
+                    value=datetime.now(),
+                    key="date_to",
+                    label_visibility="collapsed"
+                )
+
+            user_input = st.text_input(
+                "Multi-Week Search / 多周搜索",
+                placeholder=t('unified_input_search', st.session_state.language),
+                key="multiweek_search_input",
                 label_visibility="collapsed"
             )
-
-        user_input = st.text_input(
-            "Multi-Week Search / 多周搜索",
-            placeholder=t('unified_input_search', st.session_state.language),
-            key="multiweek_search_input",
-            label_visibility="collapsed"
-        )
+            st.form_submit_button(t('mode_search', st.session_state.language))
         st.caption(f"🔍 {t('search_help', st.session_state.language)}")
         search_params['date_from'] = date_from
         search_params['date_to'] = date_to
 
     elif st.session_state.current_mode == "entity":
-        col1, col2 = st.columns(2)
-        with col1:
-            entity_type = st.selectbox(
-                t('entity_type', st.session_state.language),
-                ["companies", "models", "people", "locations", "other"],
-                format_func=lambda x: {
-                    "companies": t('companies', st.session_state.language),
-                    "models": "Models",
-                    "people": t('people', st.session_state.language),
-                    "locations": t('locations', st.session_state.language),
-                    "other": t('other', st.session_state.language)
-                }[x],
-                key="entity_type_selector",
+        # Form: widget edits only trigger a search on submit
+        with st.form("entity_search_form", border=False):
+            col1, col2 = st.columns(2)
+            with col1:
+                entity_type = st.selectbox(
+                    t('entity_type', st.session_state.language),
+                    ["companies", "models", "people", "locations", "other"],
+                    format_func=lambda x: {
+                        "companies": t('companies', st.session_state.language),
+                        "models": "Models",
+                        "people": t('people', st.session_state.language),
+                        "locations": t('locations', st.session_state.language),
+                        "other": t('other', st.session_state.language)
+                    }[x],
+                    key="entity_type_selector",
+                    label_visibility="collapsed"
+                )
+            with col2:
+                default_from = datetime.now() - timedelta(days=28)
+                date_from = st.date_input(
+                    f"{t('date_range', st.session_state.language)} - From",
+                    value=default_from,
+                    key="entity_date_from",
+                    label_visibility="collapsed"
+                )
+
+            date_to = st.date_input(
+                f"{t('date_range', st.session_state.language)} - To",
+                value=datetime.now(),
+                key="entity_date_to",
                 label_visibility="collapsed"
             )
-        with col2:
-            default_from = datetime.now() - timedelta(days=28)
-            date_from = st.date_input(
-                f"{t('date_range', st.session_state.language)} - From",
-                value=default_from,
-                key="entity_date_from",
+
+            user_input = st.text_input(
+                "Entity Search / 实体搜索",
+                placeholder="e.g., OpenAI, GPT-4, Yann LeCun / 例如：OpenAI、GPT-4、Yann LeCun",
+                key="entity_search_input",
                 label_visibility="collapsed"
             )
-
-        date_to = st.date_input(
-            f"{t('date_range', st.session_state.language)} - To",
-            value=datetime.now(),
-            key="entity_date_to",
-            label_visibility="collapsed"
-        )
-
-        user_input = st.text_input(
-            "Entity Search / 实体搜索",
-            placeholder="e.g., OpenAI, GPT-4, Yann LeCun / 例如：OpenAI、GPT-4、Yann LeCun",
-            key="entity_search_input",
-            label_visibility="collapsed"
-        )
+            st.form_submit_button(t('mode_search', st.session_state.language))
         st.caption(f"🔍 {t('search_help', st.session_state.language)}")
         search_params['entity_type'] = entity_type
         search_params['date_from'] = date_from
         search_params['date_to'] = date_to
 
     else:  # Ask mode
-        user_input = st.text_input(
-            "Ask / 提问",
-            placeholder=t('unified_input_ask', st.session_state.language),
-            key="ask_input",
-            label_visibility="collapsed"
+        # Conversation so far; reset when a different briefing is opened
+        if st.session_state.get("chat_briefing") != briefing.get("date"):
+            st.session_state.chat_history = []
+            st.session_state.chat_briefing = briefing.get("date")
+
+        # Replayed with st.markdown, the same CommonMark renderer st.write_stream
+        # used live, so a turn looks the same before and after a rerun
+        for message in st.session_state.chat_history:
+            with st.chat_message(message["role"]):
+                st.markdown(message["content"])
+
+        user_input = st.chat_input(
+            t('unified_input_ask', st.session_state.language),
+            key="ask_input"
         )
 
     st.divider()
@@ -855,28 +676,54 @@ with right_col:
     # Process user input and display results
     if user_input:
         if st.session_state.current_mode == "ask":
-            # Ask mode: Question answering using current briefing
-            enriched_context = create_enriched_briefing_context(briefing.get("articles", []))
-            with st.spinner(f"💭 {t('mode_ask', st.session_state.language)}..." if st.session_state.language == "zh" else "Thinking..."):
-                response = answer_question_about_briefing(user_input, enriched_context, st.session_state.language)
-
-            st.markdown(f"**{t('ai_response', st.session_state.language)}**")
-            if response and "Error" not in response:
-                st.markdown(response)
-            else:
-                st.error(response)
+            # Ask mode: Question answering using the articles relevant to the question
+            enriched_context = build_query_context(briefing, user_input)
+            with st.chat_message("user"):
+                st.markdown(user_input)
+            with st.chat_message("assistant"):
+                try:
+                    with st.spinner(f"💭 {t('mode_ask', st.session_state.language)}..." if st.session_state.language == "zh" else "Thinking..."):
+                        response = st.write_stream(throttle_stream(
+                            answer_question_about_briefing(user_input, enriched_context, st.session_state.language)
+                        ))
+                except Exception as e:
+                    response = None
+                    st.error(f"{t('chat_error', st.session_state.language)}: {str(e)}")
+
+            # st.chat_input returns a value only on the submitting run, so
+            # each turn is recorded once and replayed from history afterwards
+            if response:
+                history = st.session_state.chat_history
+                history.extend([
+                    {"role": "user", "content": user_input},
+                    {"role": "assistant", "content": response}
+                ])
+                del history[:-CHAT_HISTORY_MAX_MESSAGES]
 
         elif st.session_state.current_mode == "this_week":
-            # This week search: Current implementation (Phase A)
-            enriched_context = create_enriched_briefing_context(briefing.get("articles", []))
-            with st.spinner(f"🔍 {t('mode_search', st.session_state.language)}..."):
-                response = search_articles_with_llm(user_input, enriched_context, st.session_state.language)
+            # This week search: answer from the local index, LLM only for
+            # deep analysis or when nothing matches locally
+            articles = briefing.get("articles", [])
+            index = briefing.get("search_index")
+            if index is None:
+                index = build_article_index(articles)
+            hits = [] if deep_analysis else search_articles_local(user_input, index)
 
             st.markdown(f"**{t('search_results_title', st.session_state.language)}**")
-            if response and "Error" not in response:
-                st.markdown(response)
+            if hits:
+                st.caption(t('local_results_hint', st.session_state.language))
+                st.html(render_article_cards((i + 1, articles[i]) for i in hits))
             else:
-                st.warning(t('no_results', st.session_state.language))
+                enriched_context = build_query_context(briefing, user_input)
+                try:
+                    with st.spinner(f"🔍 {t('mode_search', st.session_state.language)}..."):
+                        response = st.write_stream(throttle_stream(
+                            search_articles_with_llm(user_input, enriched_context, st.session_state.language)
+                        ))
+                    if not response:
+                        st.warning(t('no_results', st.session_state.language))
+                except Exception as e:
+                    st.error(f"{t('chat_error', st.session_state.language)}: {str(e)}")
 
         elif st.session_state.current_mode == "multi_week":
             # Multi-week search: Search across multiple briefings using ContextRetriever (Phase B)
@@ -891,7 +738,7 @@ with right_col:
             if results:
                 # Format and display results grouped by date
                 formatted_results = format_multi_week_results(results, st.session_state.language)
-                st.markdown(formatted_results)
+                render_markdown_blocks(formatted_results)
             else:
                 st.warning(t('no_results', st.session_state.language))
 
@@ -909,12 +756,17 @@ with right_col:
             if results:
                 # Format and display results grouped by date
                 formatted_results = format_multi_week_results(results, st.session_state.language)
-                st.markdown(formatted_results)
+                render_markdown_blocks(formatted_results)
             else:
                 st.warning(t('no_results', st.session_state.language))
 
+with right_col:
+    render_assistant(briefing)
+
 # ============================================================================
 # FOOTER
 # ============================================================================
 st.divider()
-st.caption(f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+# Report file time, formatted once when the briefing is parsed
+if briefing.get("last_updated"):
+    st.caption(f"Last updated: {briefing['last_updated']}")
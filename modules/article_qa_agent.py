@@ -14,6 +14,23 @@ from loguru import logger
 from utils.llm_client_enhanced import LLMClient
 from utils.semantic_deduplication import SemanticDeduplicator, SEMANTIC_AVAILABLE
 
+# Retrieval results kept per agent for repeated questions; oldest evicted first
+RETRIEVAL_CACHE_SIZE = 128
+
+# Lazy-loaded deduplicator shared by all agents (holds the embedding model)
+_semantic_dedup = None
+
+
+def _get_semantic_dedup() -> SemanticDeduplicator:
+    """Load the embedding model and vector store once per process; failures are retried."""
+    global _semantic_dedup
+    if _semantic_dedup is None:
+        dedup = SemanticDeduplicator(strict_mode=True)
+        if not dedup.available:
+            raise RuntimeError("embedding model unavailable")
+        _semantic_dedup = dedup
+    return _semantic_dedup
+
 
 class ArticleQAAgent:
     """Single agent for answering questions about briefing articles using ACE"""
@@ -42,7 +59,7 @@ class ArticleQAAgent:
         # Initialize semantic search if available
         if self.enable_semantic_search:
             try:
-                self.semantic_dedup = SemanticDeduplicator(strict_mode=True)
+                self.semantic_dedup = _get_semantic_dedup()
                 logger.info("Semantic search enabled for article retrieval")
             except Exception as e:
                 logger.warning(f"Failed to initialize semantic search: {e}")
@@ -51,6 +68,9 @@ class ArticleQAAgent:
         # Conversation history for ACE context
         self.conversation_history: List[Dict[str, str]] = []
         self.retrieved_articles: Dict[int, Dict[str, Any]] = {}  # Cache of retrieved articles
+        self._article_embeddings = None  # Batch-encoded articles_db, reset by update_articles
+        self._keyword_fields = None  # Lowercased search fields, reset by update_articles
+        self._retrieval_cache: Dict[str, List[Dict[str, Any]]] = {}  # Normalized query -> results
 
         logger.info(f"Article QA Agent initialized with {len(self.articles_db)} articles")
 
@@ -58,6 +78,9 @@ class ArticleQAAgent:
         """Update the articles database"""
         self.articles_db = articles
         self.retrieved_articles.clear()
+        self._article_embeddings = None
+        self._keyword_fields = None
+        self._retrieval_cache.clear()
         logger.info(f"Updated articles database: {len(articles)} articles")
 
     def answer_question(self, user_query: str) -> Dict[str, Any]:
@@ -122,12 +145,19 @@ class ArticleQAAgent:
         """
         Retrieve articles relevant to the user's query
 
-        Uses semantic search if available, falls back to keyword matching
+        Uses semantic search if available, falls back to keyword matching.
+        Results are cached per normalized query until update_articles().
         """
         if not self.articles_db:
             return []
 
+        cache_key = " ".join(query.lower().split())
+        cached = self._retrieval_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
         retrieved = []
+        degraded = False
 
         # Semantic search (if available and enabled)
         if self.enable_semantic_search:
@@ -136,51 +166,84 @@ class ArticleQAAgent:
                 retrieved.extend(semantic_results[:5])  # Top 5 by similarity
             except Exception as e:
                 logger.warning(f"Semantic search failed, falling back to keyword matching: {e}")
+                degraded = True
 
         # Keyword-based search (always available as fallback)
         keyword_results = self._keyword_search(query)
 
-        # Merge results (prefer semantic, add keyword-only results)
+        # Merge results (prefer semantic, add keyword-only results); both
+        # searches return the same article objects, so identity is enough
         retrieved_ids = {id(r) for r in retrieved}
         for result in keyword_results[:5]:
-            if id(result) not in retrieved_ids and result not in retrieved:
+            if id(result) not in retrieved_ids:
                 retrieved.append(result)
+                retrieved_ids.add(id(result))
 
         # Limit to top 8 articles
-        return retrieved[:8]
+        retrieved = retrieved[:8]
+        # A keyword-only fallback is not cached, so the next call retries semantic search
+        if not degraded:
+            if len(self._retrieval_cache) >= RETRIEVAL_CACHE_SIZE:
+                self._retrieval_cache.pop(next(iter(self._retrieval_cache)))
+            self._retrieval_cache[cache_key] = retrieved
+        return list(retrieved)
 
     def _semantic_search(self, query: str) -> List[Dict[str, Any]]:
         """
         Search articles using semantic similarity
 
-        Returns articles ordered by relevance
+        Returns articles ordered by relevance. Encoder errors propagate so
+        the caller can fall back to keyword matching.
         """
         if not self.enable_semantic_search:
             return []
 
-        try:
-            query_embedding = self.semantic_dedup.model.encode(query)
-            scores = []
-
-            for i, article in enumerate(self.articles_db):
-                # Create searchable text from article
-                article_text = f"{article.get('title', '')} {article.get('paraphrased_content', '')}"
-                article_embedding = self.semantic_dedup.model.encode(article_text)
-
-                # Calculate cosine similarity
-                similarity = float(
-                    (query_embedding @ article_embedding) /
-                    (np.linalg.norm(query_embedding) * np.linalg.norm(article_embedding) + 1e-8)
-                )
-                scores.append((i, article, similarity))
+        query_embedding = np.asarray(self.semantic_dedup.model.encode(query), dtype=float)
+        query_embedding = query_embedding / max(np.linalg.norm(query_embedding), 1e-8)
 
-            # Sort by similarity and return top results
-            scores.sort(key=lambda x: x[2], reverse=True)
-            return [item[1] for item in scores if item[2] > 0.3][:10]
+        # Cosine similarity against every article in one matrix product
+        similarities = self._get_article_embeddings() @ query_embedding
 
-        except Exception as e:
-            logger.warning(f"Semantic search error: {e}")
-            return []
+        # Sort by similarity and return top results
+        order = np.argsort(-similarities, kind="stable")
+        order = order[similarities[order] > 0.3][:10]
+        return [self.articles_db[i] for i in order]
+
+    def _get_article_embeddings(self):
+        """
+        Unit-normalized embeddings for all articles, encoded in one batch
+
+        Computed on the first semantic search and reused until
+        update_articles() replaces the articles.
+        """
+        if self._article_embeddings is None:
+            # Create searchable text from each article
+            texts = [
+                f"{article.get('title', '')} {article.get('paraphrased_content', '')}"
+                for article in self.articles_db
+            ]
+            embeddings = np.asarray(self.semantic_dedup.model.encode(texts), dtype=float)
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            self._article_embeddings = embeddings / np.maximum(norms, 1e-8)
+        return self._article_embeddings
+
+    def _get_keyword_fields(self) -> List[Tuple[str, str, str]]:
+        """
+        Lowercased (title, content, categories) for each article
+
+        Lowercasing full article content dominated keyword search, so it is
+        done once and reused until update_articles() replaces the articles.
+        """
+        if self._keyword_fields is None:
+            self._keyword_fields = [
+                (
+                    article.get('title', '').lower(),
+                    article.get('paraphrased_content', '').lower(),
+                    ' '.join(article.get('categories', [])).lower()
+                )
+                for article in self.articles_db
+            ]
+        return self._keyword_fields
 
     def _keyword_search(self, query: str) -> List[Dict[str, Any]]:
         """
@@ -193,22 +256,20 @@ class ArticleQAAgent:
 
         scored_articles = []
 
-        for article in self.articles_db:
+        for article, (title_lower, content_lower, category_str) in zip(
+            self.articles_db, self._get_keyword_fields()
+        ):
             score = 0
 
             # Title matches (high weight)
-            title_lower = article.get('title', '').lower()
             title_matches = sum(1 for word in query_words if word in title_lower)
             score += title_matches * 3
 
             # Content matches (medium weight)
-            content_lower = article.get('paraphrased_content', '').lower()
             content_matches = sum(1 for word in query_words if word in content_lower)
             score += content_matches * 1.5
 
             # Category matches (medium weight)
-            categories = article.get('categories', [])
-            category_str = ' '.join(categories).lower()
             category_matches = sum(1 for word in query_words if word in category_str)
             score += category_matches * 2
 
@@ -75,10 +75,6 @@ class ReprintDetector:
         content = article.get('content', article.get('summary', ''))[:500]
         return f"{title}. {content}"
     
-    def _cosine_similarity(self, a, b) -> float:
-        """Compute cosine similarity."""
-        return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
-    
     def detect_reprints(
         self,
         articles: List[Dict[str, Any]]
@@ -103,21 +99,20 @@ class ReprintDetector:
         texts = [self._get_text(a) for a in articles]
         embeddings = self.model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
         
+        # All pairwise cosine similarities in one matrix product
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        normalized = embeddings / np.maximum(norms, 1e-12)
+        similar = (normalized @ normalized.T) >= self.REPRINT_THRESHOLD
+        np.fill_diagonal(similar, False)
+        
         results = {}
         n = len(articles)
         
         for i in range(n):
-            similar_indices = []
-            sources = {articles[i].get('source', 'unknown')}
-            
             # Find similar articles
-            for j in range(n):
-                if i == j:
-                    continue
-                sim = self._cosine_similarity(embeddings[i], embeddings[j])
-                if sim >= self.REPRINT_THRESHOLD:
-                    similar_indices.append(j)
-                    sources.add(articles[j].get('source', 'unknown'))
+            similar_indices = np.flatnonzero(similar[i]).tolist()
+            sources = {articles[i].get('source', 'unknown')}
+            sources.update(articles[j].get('source', 'unknown') for j in similar_indices)
             
             # Compute metrics
             duplicate_ratio = len(similar_indices) / (n - 1) if n > 1 else 0
@@ -0,0 +1,131 @@
+"""Tests for article retrieval in ArticleQAAgent."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from modules.article_qa_agent import ArticleQAAgent
+
+
+class FakeModel:
+    """Embedding model double: one axis per keyword, counts encode calls."""
+
+    KEYWORDS = ["openai", "chip", "robot"]
+
+    def __init__(self):
+        self.calls = 0
+
+    def _embed(self, text):
+        text = text.lower()
+        return np.array([float(word in text) for word in self.KEYWORDS])
+
+    def encode(self, texts):
+        self.calls += 1
+        if isinstance(texts, str):
+            return self._embed(texts)
+        return np.array([self._embed(text) for text in texts])
+
+
+ARTICLES = [
+    {"title": "OpenAI ships GPT-5", "paraphrased_content": "New model", "categories": ["llm"]},
+    {"title": "Chip export rules", "paraphrased_content": "NVIDIA affected", "categories": ["hardware"]},
+    {"title": "Robot startup raises", "paraphrased_content": "Humanoid robot funding", "categories": []},
+]
+
+
+def make_agent(articles=ARTICLES):
+    """Build an agent with a fake embedding model and no LLM client."""
+    agent = ArticleQAAgent(llm_client=object(), articles_db=list(articles), enable_semantic_search=False)
+    agent.enable_semantic_search = True
+    agent.semantic_dedup = type("Dedup", (), {"model": FakeModel()})()
+    return agent
+
+
+class TestSemanticSearch:
+    """Tests for embedding-based retrieval."""
+
+    def test_ranks_by_similarity(self):
+        """Articles similar to the query come first; dissimilar ones are dropped."""
+        agent = make_agent()
+        results = agent._semantic_search("robot news")
+        assert [a["title"] for a in results] == ["Robot startup raises"]
+
+    def test_articles_encoded_once(self):
+        """Article embeddings are batch-encoded once and reused across queries."""
+        agent = make_agent()
+        agent._semantic_search("openai")
+        agent._semantic_search("chip")
+        # One batch for the articles plus one call per query
+        assert agent.semantic_dedup.model.calls == 3
+
+    def test_update_articles_resets_embeddings(self):
+        """Replacing the articles re-encodes them on the next search."""
+        agent = make_agent()
+        agent._semantic_search("openai")
+        agent.update_articles(ARTICLES[:1])
+        assert [a["title"] for a in agent._semantic_search("openai")] == ["OpenAI ships GPT-5"]
+
+    def test_zero_vectors_do_not_divide_by_zero(self):
+        """Articles and queries with empty embeddings are simply not matched."""
+        agent = make_agent()
+        assert agent._semantic_search("nothing relevant") == []
+
+
+class TestKeywordSearch:
+    """Tests for keyword-based retrieval."""
+
+    def test_weights_title_over_content(self):
+        """Title hits outrank content-only hits."""
+        agent = make_agent([
+            {"title": "Market wrap", "paraphrased_content": "NVIDIA chips"},
+            {"title": "NVIDIA earnings", "paraphrased_content": ""},
+        ])
+        assert [a["title"] for a in agent._keyword_search("nvidia")] == ["NVIDIA earnings", "Market wrap"]
+
+    def test_update_articles_refreshes_fields(self):
+        """Cached lowercase fields follow update_articles()."""
+        agent = make_agent()
+        assert agent._keyword_search("humanoid") == [ARTICLES[2]]
+        agent.update_articles(ARTICLES[:2])
+        assert agent._keyword_search("humanoid") == []
+
+
+class TestRetrieveRelevantArticles:
+    """Tests for merging semantic and keyword results."""
+
+    def test_merges_without_duplicates(self):
+        """Articles found by both searches appear once, semantic hits first."""
+        agent = make_agent()
+        results = agent._retrieve_relevant_articles("robot chip")
+        assert [a["title"] for a in results] == ["Chip export rules", "Robot startup raises"]
+
+    def test_repeated_query_uses_cache(self):
+        """Queries differing only in case and spacing reuse the earlier retrieval."""
+        agent = make_agent()
+        first = agent._retrieve_relevant_articles("Robot")
+        calls = agent.semantic_dedup.model.calls
+        assert agent._retrieve_relevant_articles("  robot ") == first
+        assert agent.semantic_dedup.model.calls == calls
+
+        agent.update_articles(ARTICLES[:2])
+        assert agent._retrieve_relevant_articles("robot") == []
+
+    def test_keyword_fallback_is_not_cached(self):
+        """A retrieval degraded by a semantic search failure is retried next time."""
+        agent = make_agent()
+        model = agent.semantic_dedup.model
+        encode = model.encode
+
+        def failing_encode(texts):
+            raise RuntimeError("model unavailable")
+
+        model.encode = failing_encode
+        assert [a["title"] for a in agent._retrieve_relevant_articles("robot")] == ["Robot startup raises"]
+        assert agent._retrieval_cache == {}
+
+        model.encode = encode
+        agent._retrieve_relevant_articles("robot")
+        assert "robot" in agent._retrieval_cache
@@ -0,0 +1,212 @@
+"""Tests for the Streamlit-free briefing UI helpers."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.briefing_helpers import (
+    parse_articles_from_markdown,
+    briefing_sort_key,
+    split_markdown_blocks,
+    build_article_index,
+    search_articles_local,
+    select_relevant_articles,
+    create_enriched_briefing_context,
+    render_article_card_html,
+    format_multi_week_results,
+    throttle_stream,
+)
+
+
+SAMPLE_BRIEFING = """# AI Weekly
+
+**1. OpenAI ships GPT-5**
+New flagship model released.
+**来源**: TechCrunch
+**URL**: https://example.com/gpt5
+
+**2. 芯片出口管制**
+**来源**: 36kr
+"""
+
+
+class TestParseArticles:
+    """Tests for parsing articles out of briefing markdown."""
+
+    def test_parses_title_summary_and_meta(self):
+        """Numbered bold titles start articles with their metadata."""
+        articles = parse_articles_from_markdown(SAMPLE_BRIEFING)
+        assert articles[0] == {
+            "title": "OpenAI ships GPT-5",
+            "summary": "New flagship model released.",
+            "url": "https://example.com/gpt5",
+            "source": "TechCrunch",
+        }
+
+    def test_missing_summary_placeholder(self):
+        """Articles without a summary line get the placeholder."""
+        articles = parse_articles_from_markdown(SAMPLE_BRIEFING)
+        assert articles[1]["title"] == "芯片出口管制"
+        assert articles[1]["summary"] == "无摘要"
+
+    def test_full_width_colon_and_last_article_body(self):
+        """Full-width colons are accepted and the last article runs to the end."""
+        content = "**1. A**\n摘要\n**来源**：新华社\nURL：https://x.cn/a"
+        assert parse_articles_from_markdown(content) == [{
+            "title": "A", "summary": "摘要", "url": "https://x.cn/a", "source": "新华社"
+        }]
+
+    def test_indented_bold_number_ends_article(self):
+        """An indented numbered bold line ends the article without starting one."""
+        content = "**1. A**\n  **2. not an article**\nstray text"
+        articles = parse_articles_from_markdown(content)
+        assert [a["title"] for a in articles] == ["A"]
+        assert articles[0]["summary"] == "无摘要"
+
+
+class TestLocalSearch:
+    """Tests for the local inverted index search."""
+
+    ARTICLES = [
+        {"title": "OpenAI ships GPT-5", "summary": "新模型发布"},
+        {"title": "芯片出口管制", "summary": "NVIDIA 受影响"},
+        {"title": "OpenAI pricing", "summary": "API 定价下调"},
+    ]
+
+    def test_all_tokens_of_a_term_must_match(self):
+        """A term matches only if all of its tokens do."""
+        index = build_article_index(self.ARTICLES)
+        assert search_articles_local("gpt-5", index) == [0]
+        assert search_articles_local("gpt-4", index) == []
+
+    def test_chinese_substrings_match(self):
+        """CJK queries match via characters and bigrams."""
+        index = build_article_index(self.ARTICLES)
+        assert search_articles_local("芯片", index) == [1]
+        assert search_articles_local("定价", index) == [2]
+        assert search_articles_local("片芯", index) == []
+
+    def test_ranked_by_matched_terms(self):
+        """Articles matching more terms come first."""
+        index = build_article_index(self.ARTICLES)
+        assert search_articles_local("定价、openai", index) == [2, 0]
+
+    def test_select_relevant_articles(self):
+        """Top-k positions are returned, or None when nothing matches."""
+        index = build_article_index(self.ARTICLES)
+        assert select_relevant_articles("定价、openai", index, k=1) == [2]
+        assert select_relevant_articles("openai", index) == [0, 2]
+        assert select_relevant_articles("anthropic", index) is None
+
+    def test_select_keeps_ties_unnarrowed(self):
+        """Equally good matches on both sides of the cut-off are not narrowed."""
+        index = build_article_index(self.ARTICLES)
+        assert select_relevant_articles("openai", index, k=1) is None
+
+    def test_generic_questions_are_not_narrowed(self):
+        """Stopwords and short tokens such as "ai" never select articles."""
+        articles = [
+            {"title": "AI chips: each of the new points", "summary": "Summarize all"},
+            {"title": "The AI article of the week", "summary": "Key stories"},
+        ]
+        index = build_article_index(articles)
+        assert select_relevant_articles("Summarize all articles", index) is None
+        assert select_relevant_articles("Summarize the key points of each article", index) is None
+        assert select_relevant_articles("What are the biggest AI stories this week?", index) is None
+        assert select_relevant_articles("总结所有文章", index) is None
+
+    def test_no_match(self):
+        """Unknown terms and empty queries return nothing."""
+        index = build_article_index(self.ARTICLES)
+        assert search_articles_local("anthropic", index) == []
+        assert search_articles_local("  ", index) == []
+
+
+class TestBriefingSortKey:
+    """Tests for ordering briefing files by date."""
+
+    def test_orders_by_date_across_prefixes(self):
+        """The stamped date outranks the filename prefix."""
+        stems = ["product_briefing_20260122", "ai_briefing_20260210", "ai_briefing_20251026_cn", "notes_briefing_x"]
+        assert sorted(stems, key=briefing_sort_key, reverse=True) == [
+            "ai_briefing_20260210",
+            "product_briefing_20260122",
+            "ai_briefing_20251026_cn",
+            "notes_briefing_x",
+        ]
+
+
+class TestSplitMarkdownBlocks:
+    """Tests for blank-line markdown splitting."""
+
+    def test_splits_on_blank_lines(self):
+        """Blank lines separate blocks."""
+        assert split_markdown_blocks("a\nb\n\n\nc") == ["a\nb", "c"]
+
+    def test_keeps_fenced_code_together(self):
+        """Blank lines inside fenced code do not split the block."""
+        content = "```\nx\n\ny\n```\n\ntail"
+        assert split_markdown_blocks(content) == ["```\nx\n\ny\n```", "tail"]
+
+
+class TestRendering:
+    """Tests for card, context and result rendering."""
+
+    def test_card_escapes_html(self):
+        """Titles and URLs are escaped in the card HTML."""
+        card = render_article_card_html(1, "<b>x</b>", "", "", "https://a.b/?q='1'")
+        assert "&lt;b&gt;x&lt;/b&gt;" in card
+        assert "&#x27;1&#x27;" in card
+        assert "article-summary" not in card
+
+    def test_card_renders_inline_markdown(self):
+        """Links, bold and code in summaries render as HTML, not literal markdown."""
+        card = render_article_card_html(
+            1, "**GPT-5** ships", "See [the post](https://a.b/x?y=1&z=2) and `api` <now>", "", ""
+        )
+        assert "<strong>GPT-5</strong> ships" in card
+        assert "<a href='https://a.b/x?y=1&amp;z=2' target='_blank'>the post</a>" in card
+        assert "<code>api</code> &lt;now&gt;" in card
+        assert "[the post]" not in card
+
+    def test_card_does_not_link_unsafe_urls(self):
+        """Only http(s) markdown links become anchors."""
+        card = render_article_card_html(1, "t", "[x](javascript:alert(1))", "", "")
+        assert "<a" not in card
+
+    def test_enriched_context_lists_articles(self):
+        """Context includes each article title, summary and source."""
+        context = create_enriched_briefing_context(parse_articles_from_markdown(SAMPLE_BRIEFING))
+        assert "## 1. OpenAI ships GPT-5" in context
+        assert "来源: TechCrunch | URL: https://example.com/gpt5" in context
+
+    def test_focused_context_lists_other_titles(self):
+        """Articles outside the focus are reduced to numbered titles."""
+        articles = parse_articles_from_markdown(SAMPLE_BRIEFING)
+        context = create_enriched_briefing_context(articles, focus=[1])
+        assert "## 2. 芯片出口管制" in context
+        assert "- 1. OpenAI ships GPT-5" in context
+        assert "TechCrunch" not in context
+
+    def test_results_grouped_newest_first(self):
+        """Search results are grouped under dates, newest first."""
+        output = format_multi_week_results([
+            {"title": "Old", "report_date": "2026-01-05"},
+            {"title": "New", "report_date": "2026-01-12"},
+        ], lang="en")
+        assert output.index("2026-01-12") < output.index("2026-01-05")
+        assert output.startswith("## Found 2 relevant articles")
+
+
+class TestThrottleStream:
+    """Tests for coalescing streamed chunks."""
+
+    def test_preserves_content(self):
+        """Throttling never drops or reorders text."""
+        chunks = ["a", "b", "c"]
+        assert "".join(throttle_stream(iter(chunks), interval=10)) == "abc"
+
+    def test_large_interval_coalesces(self):
+        """Chunks arriving within one interval are yielded together."""
+        assert list(throttle_stream(iter(["a", "b", "c"]), interval=10)) == ["abc"]
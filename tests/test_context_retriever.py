@@ -0,0 +1,186 @@
+"""Tests for cached article context retrieval and search."""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.context_retriever import ContextRetriever
+
+
+def _write_report(cache_dir: Path, date: str, articles):
+    path = cache_dir / f"{date}.json"
+    path.write_text(
+        json.dumps({"report_date": date, "articles": articles}, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    return path
+
+
+@pytest.fixture
+def retriever(tmp_path):
+    _write_report(tmp_path, "20260105", [
+        {"id": "001", "title": "OpenAI ships GPT-5", "full_content": "Launch details"},
+        {"id": "002", "title": "芯片出口管制", "full_content": "NVIDIA 受影响"},
+    ])
+    _write_report(tmp_path, "20260112", [
+        {"id": "001", "title": "Anthropic funding", "full_content": "Raises new round from gpt fans"},
+    ])
+    return ContextRetriever(cache_dir=str(tmp_path))
+
+
+class TestSearchByKeyword:
+    """Tests for keyword search over cached reports."""
+
+    def test_case_insensitive_match(self, retriever):
+        """Keyword matches title or content regardless of case."""
+        results = retriever.search_by_keyword("gpt")
+        titles = {r["title"] for r in results}
+        assert titles == {"OpenAI ships GPT-5", "Anthropic funding"}
+
+    def test_chinese_match(self, retriever):
+        """Chinese keywords match content."""
+        results = retriever.search_by_keyword("nvidia")
+        assert [r["title"] for r in results] == ["芯片出口管制"]
+
+    def test_date_filter(self, retriever):
+        """Date range excludes reports outside the window."""
+        results = retriever.search_by_keyword("gpt", date_from="2026-01-10")
+        assert [r["report_date"] for r in results] == ["2026-01-12"]
+
+    def test_match_does_not_span_fields(self, retriever):
+        """A query cannot match across the title/content boundary."""
+        assert retriever.search_by_keyword("gpt-5launch") == []
+
+    def test_multi_term_matches_any(self, retriever):
+        """Comma/、/space separated terms match articles containing any term."""
+        results = retriever.search_by_keyword("launch、芯片")
+        assert {r["title"] for r in results} == {"OpenAI ships GPT-5", "芯片出口管制"}
+
+    def test_multi_term_escapes_regex(self, retriever):
+        """Terms are matched literally, not as regex syntax."""
+        assert retriever.search_by_keyword("gpt-5, (") != []
+        assert retriever.search_by_keyword(".*, ?") == []
+
+    def test_results_do_not_mutate_index(self, retriever):
+        """Annotating results leaves the cached articles untouched."""
+        retriever.search_by_keyword("gpt")
+        for entries in retriever._keyword_index.values():
+            for article, _ in entries[1]:
+                assert "report_date" not in article
+
+    def test_index_refreshes_on_file_change(self, retriever, tmp_path):
+        """Rewriting a cache file invalidates its search blobs."""
+        assert retriever.search_by_keyword("claude") == []
+
+        path = _write_report(tmp_path, "20260112", [
+            {"id": "001", "title": "Claude update", "full_content": ""},
+        ])
+        stat = path.stat()
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+        assert [r["title"] for r in retriever.search_by_keyword("claude")] == ["Claude update"]
+
+
+class TestLoadLatestReport:
+    """Tests for picking the newest cached report."""
+
+    def test_returns_newest_by_date(self, retriever):
+        """The most recent YYYYMMDD file wins."""
+        report = retriever.load_latest_report()
+        assert report["report_date"] == "20260112"
+
+    def test_ignores_non_date_files(self, retriever, tmp_path):
+        """Stray JSON files are not mistaken for reports."""
+        (tmp_path / "zz_index.json").write_text("{}", encoding="utf-8")
+        assert retriever.load_latest_report()["report_date"] == "20260112"
+
+    def test_empty_cache(self, tmp_path):
+        """An empty cache directory yields None."""
+        assert ContextRetriever(cache_dir=str(tmp_path)).load_latest_report() is None
+
+
+class TestReportCache:
+    """Tests for memoized report parsing."""
+
+    def test_reuses_parsed_report(self, retriever):
+        """Unchanged files are parsed once."""
+        first = retriever.load_report_by_date("2026-01-05")
+        second = retriever.load_report_by_date("20260105")
+        assert first is second
+
+    def test_reparses_after_change(self, retriever, tmp_path):
+        """A newer mtime triggers a fresh parse."""
+        first = retriever.load_report_by_date("2026-01-05")
+        path = _write_report(tmp_path, "20260105", [{"id": "009", "title": "New"}])
+        stat = path.stat()
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+        second = retriever.load_report_by_date("2026-01-05")
+        assert second is not first
+        assert second["articles"][0]["title"] == "New"
+
+    def test_week_articles_leave_cache_untouched(self, retriever):
+        """Trend aggregation tags copies, not the shared cached articles."""
+        from utils.trend_aggregator import TrendAggregator
+
+        # Skip __init__: only the context is needed, not the entity extractor
+        aggregator = TrendAggregator.__new__(TrendAggregator)
+        aggregator.context = retriever
+        articles = aggregator._get_articles_for_week("2026-W02")
+        assert [a["report_date"] for a in articles] == ["2026-01-05", "2026-01-05"]
+        cached = retriever.load_report_by_date("2026-01-05")["articles"]
+        assert all("report_date" not in article for article in cached)
+
+
+class TestSearchByEntity:
+    """Tests for entity search over cached reports."""
+
+    @pytest.fixture
+    def entity_retriever(self, tmp_path):
+        _write_report(tmp_path, "20260105", [
+            {"id": "001", "title": "GPT-5", "entities": {"companies": ["OpenAI"], "models": ["GPT-5"]}},
+            {"id": "002", "title": "Chips", "entities": {"companies": ["NVIDIA", "TSMC"], "models": []}},
+        ])
+        return ContextRetriever(cache_dir=str(tmp_path))
+
+    def test_match_any_type(self, entity_retriever):
+        """Without a type filter, the first matching type is reported."""
+        results = entity_retriever.search_by_entity("tsmc")
+        assert [(r["title"], r["matched_entity_type"]) for r in results] == [("Chips", "companies")]
+
+    def test_type_filter(self, entity_retriever):
+        """A type filter restricts matches to that entity list."""
+        assert [r["title"] for r in entity_retriever.search_by_entity("gpt", "models")] == ["GPT-5"]
+        assert entity_retriever.search_by_entity("gpt", "companies") == []
+
+    def test_match_does_not_span_entities(self, entity_retriever):
+        """A query cannot match across two entities of the same type."""
+        assert entity_retriever.search_by_entity("nvidiatsmc") == []
+
+    def test_empty_type_list_never_matches(self, entity_retriever):
+        """An empty entity list does not match an empty query."""
+        results = entity_retriever.search_by_entity("", "models")
+        assert [r["title"] for r in results] == ["GPT-5"]
+
+
+class TestResultProjection:
+    """Tests for trimming search results to requested fields."""
+
+    def test_keyword_results_keep_requested_fields(self, retriever):
+        """Only the requested fields plus report metadata are returned."""
+        results = retriever.search_by_keyword("launch", fields=["title", "url"])
+        assert results == [{"title": "OpenAI ships GPT-5", "report_date": "2026-01-05"}]
+
+    def test_entity_results_keep_requested_fields(self, tmp_path):
+        """Entity matches are projected the same way."""
+        _write_report(tmp_path, "20260105", [
+            {"id": "001", "title": "GPT-5", "full_content": "x" * 100, "entities": {"companies": ["OpenAI"]}},
+        ])
+        retriever = ContextRetriever(cache_dir=str(tmp_path))
+        results = retriever.search_by_entity("openai", fields=["title"])
+        assert results == [{"title": "GPT-5", "report_date": "2026-01-05", "matched_entity_type": "companies"}]
@@ -0,0 +1,53 @@
+"""Tests for reprint detection in the gravity engine."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import modules.gravity_engine as gravity_engine
+from modules.gravity_engine import ReprintDetector
+
+
+class FakeModel:
+    """Embedding model double returning fixed vectors in article order."""
+
+    def __init__(self, vectors):
+        self.vectors = np.array(vectors, dtype=float)
+
+    def encode(self, texts, **kwargs):
+        return self.vectors[:len(texts)]
+
+
+def make_detector(monkeypatch, vectors):
+    """Build a detector over fixed embeddings without loading a model."""
+    monkeypatch.setattr(gravity_engine, "np", np)
+    detector = ReprintDetector.__new__(ReprintDetector)
+    detector.available = True
+    detector.model = FakeModel(vectors)
+    return detector
+
+
+class TestDetectReprints:
+    """Tests for pairwise reprint detection."""
+
+    def test_similar_indices_are_symmetric(self, monkeypatch):
+        """Near-identical embeddings mark each other; the article itself is excluded."""
+        detector = make_detector(monkeypatch, [[1, 0], [0.99, 0.05], [0, 1]])
+        articles = [{"source": "a"}, {"source": "b"}, {"source": "c"}]
+        results = detector.detect_reprints(articles)
+
+        assert results[0]["similar_indices"] == [1]
+        assert results[1]["similar_indices"] == [0]
+        assert results[2]["similar_indices"] == []
+        assert results[0]["unique_source_count"] == 2
+        assert results[0]["duplicate_ratio"] == 0.5
+
+    def test_zero_embedding_matches_nothing(self, monkeypatch):
+        """An all-zero embedding is treated as dissimilar rather than dividing by zero."""
+        detector = make_detector(monkeypatch, [[0, 0], [1, 0]])
+        results = detector.detect_reprints([{}, {}])
+        assert results[0]["similar_indices"] == []
+        assert results[1]["similar_indices"] == []
@@ -0,0 +1,22 @@
+"""Tests for UI translation lookup."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.i18n import t
+
+
+class TestTranslate:
+    """Tests for t()."""
+
+    def test_returns_requested_language(self):
+        """Known keys resolve in the requested language."""
+        assert t("page_title", "zh") == "AI行业周报"
+        assert t("page_title", "en") == "AI Industry Weekly Briefing"
+
+    def test_falls_back_to_english_then_key(self):
+        """Unknown languages fall back to English, unknown keys to the key itself."""
+        assert t("page_title", "fr") == "AI Industry Weekly Briefing"
+        assert t("no_such_key", "zh") == "no_such_key"
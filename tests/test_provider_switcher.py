@@ -0,0 +1,365 @@
+"""Tests for provider fallback in ProviderSwitcher."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.provider_switcher import ProviderSwitcher
+
+
+class FakeRateLimit(Exception):
+    """Stand-in for a provider rate-limit error."""
+
+    def __init__(self, message="429", retry_after=None):
+        super().__init__(message)
+        if retry_after is not None:
+            self.response = type("Response", (), {"headers": {"retry-after": retry_after}})()
+
+
+class FakeProvider:
+    """Minimal provider double with scripted chat/stream behavior."""
+
+    def __init__(self, chunks=None, error=None, gate=None):
+        self.chunks = chunks or []
+        self.error = error
+        self.gate = gate
+        self.calls = 0
+        self.stats = {}
+        self.is_available = True
+        self.last_error = None
+
+    def chat(self, system_prompt, user_message, max_tokens=1024, temperature=0.7):
+        self.calls += 1
+        if self.gate:
+            self.gate.wait(timeout=5)
+        if self.error:
+            raise self.error
+        return "".join(self.chunks), {}
+
+    def chat_stream(self, system_prompt, user_message, max_tokens=1024, temperature=0.7):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        yield from self.chunks
+
+    def detect_rate_limit(self, error):
+        return isinstance(error, FakeRateLimit)
+
+
+def make_switcher(providers):
+    """Build a switcher over fake providers without reading config or env."""
+    switcher = ProviderSwitcher.__new__(ProviderSwitcher)
+    switcher.config = {"providers": []}
+    switcher.providers = dict(providers)
+    switcher.provider_queue = list(providers)
+    switcher.tier_model_indices = {}
+    switcher.openrouter_keys = []
+    switcher.current_key_index = 0
+    switcher.api_keys = {}
+    switcher.key_indices = {}
+    switcher.key_cooldowns = {}
+    switcher.cooldowns = {}
+    switcher.failure_counts = {}
+    switcher._inflight = {}
+    switcher._inflight_lock = threading.Lock()
+    switcher._state_lock = threading.RLock()
+    switcher.current_provider_id = switcher.provider_queue[0]
+    switcher.current_provider = providers[switcher.current_provider_id]
+    switcher._get_or_create_provider = lambda spec: switcher.providers[spec]
+    return switcher
+
+
+class TestQueryStream:
+    """Tests for streaming queries."""
+
+    def test_yields_chunks_in_order(self):
+        """Chunks from the active provider are passed through unchanged."""
+        switcher = make_switcher({"kimi": FakeProvider(chunks=["Hel", "lo", "!"])})
+        assert list(switcher.query_stream("hi")) == ["Hel", "lo", "!"]
+
+    def test_falls_back_before_first_chunk(self):
+        """A rate limit while opening the stream switches provider."""
+        primary = FakeProvider(error=FakeRateLimit("429"))
+        backup = FakeProvider(chunks=["ok"])
+        switcher = make_switcher({"kimi": primary, "kimi25": backup})
+
+        assert "".join(switcher.query_stream("hi")) == "ok"
+        assert switcher.current_provider_id == "kimi25"
+
+    def test_raises_when_all_providers_exhausted(self):
+        """Exhausting every provider surfaces a RuntimeError."""
+        switcher = make_switcher({"kimi": FakeProvider(error=FakeRateLimit("429"))})
+        with pytest.raises(RuntimeError):
+            list(switcher.query_stream("hi"))
+
+
+class TestCooldowns:
+    """Tests for rate-limit cooldowns and the circuit breaker."""
+
+    def test_retry_after_header_sets_cooldown(self, monkeypatch):
+        """A Retry-After header decides how long the provider is skipped."""
+        monkeypatch.setattr("utils.provider_switcher.time.monotonic", lambda: 100.0)
+        primary = FakeProvider(error=FakeRateLimit(retry_after="30"))
+        switcher = make_switcher({"kimi": primary, "kimi25": FakeProvider(chunks=["ok"])})
+
+        assert switcher.query("hi") == "ok"
+        assert switcher.cooldowns == {"kimi": 130.0}
+
+    def test_retry_hint_in_message(self):
+        """'try again in Xs' in the error body is used when there is no header."""
+        error = FakeRateLimit("Rate limit reached, please try again in 7.5s")
+        assert ProviderSwitcher._parse_retry_after(error) == 7.5
+
+    def test_returns_to_primary_after_cooldown(self, monkeypatch):
+        """Once the cooldown expires, queries go back to the preferred provider."""
+        clock = [100.0]
+        monkeypatch.setattr("utils.provider_switcher.time.monotonic", lambda: clock[0])
+        primary = FakeProvider(error=FakeRateLimit(retry_after="30"))
+        backup = FakeProvider(chunks=["backup"])
+        switcher = make_switcher({"kimi": primary, "kimi25": backup})
+
+        assert switcher.query("a") == "backup"
+        assert switcher.query("b") == "backup"
+        assert primary.calls == 1
+
+        clock[0] = 131.0
+        primary.error = None
+        primary.chunks = ["primary"]
+        assert switcher.query("c") == "primary"
+
+    def test_expired_cooldown_cleared_concurrently(self, monkeypatch):
+        """An expired entry removed by another session in the meantime does not raise."""
+        monkeypatch.setattr("utils.provider_switcher.time.monotonic", lambda: 100.0)
+
+        class RacingCooldowns(dict):
+            """Another session clears the entry right after it is read."""
+
+            def get(self, key, default=None):
+                value = super().get(key, default)
+                super().pop(key, None)
+                return value
+
+        switcher = make_switcher({"kimi": FakeProvider()})
+        switcher.cooldowns = RacingCooldowns(kimi=50.0)
+        assert not switcher._in_cooldown("kimi")
+
+    def test_timeout_keeps_next_query_on_fallback(self, monkeypatch):
+        """A provider abandoned on timeout is not retried by the next query until its cooldown ends."""
+        clock = [100.0]
+        monkeypatch.setattr("utils.provider_switcher.time.monotonic", lambda: clock[0])
+        primary = FakeProvider(error=TimeoutError("Request timed out"))
+        backup = FakeProvider(chunks=["backup"])
+        switcher = make_switcher({"kimi": primary, "kimi25": backup})
+
+        assert switcher.query("a") == "backup"
+        assert switcher.query("b") == "backup"
+        assert primary.calls == 1
+
+        clock[0] = 161.0
+        primary.error = None
+        primary.chunks = ["primary"]
+        assert switcher.query("c") == "primary"
+
+    def test_circuit_breaker_switches_after_repeated_failures(self):
+        """Repeated non-rate-limit errors move on to the next provider."""
+        primary = FakeProvider(error=ValueError("502 bad gateway"))
+        backup = FakeProvider(chunks=["ok"])
+        switcher = make_switcher({"kimi": primary, "kimi25": backup})
+
+        assert switcher.query("hi") == "ok"
+        assert primary.calls == 3
+        assert "kimi" in switcher.cooldowns
+
+    def test_client_errors_do_not_open_circuit_breaker(self):
+        """A 400 is retried but never benches a healthy provider."""
+        class FakeBadRequest(Exception):
+            status_code = 400
+
+        primary = FakeProvider(error=FakeBadRequest("Error code: 400 - invalid max_tokens"))
+        backup = FakeProvider(chunks=["ok"])
+        switcher = make_switcher({"kimi": primary, "kimi25": backup})
+
+        with pytest.raises(FakeBadRequest):
+            switcher.query("hi")
+        assert backup.calls == 0
+        assert switcher.cooldowns == {}
+        assert switcher.current_provider_id == "kimi"
+
+    def test_concurrent_failures_switch_once(self):
+        """Two sessions failing on the same provider advance the queue by one step."""
+        gate = threading.Event()
+        primary = FakeProvider(error=FakeRateLimit("429"), gate=gate)
+        backup = FakeProvider(chunks=["backup"])
+        last = FakeProvider(chunks=["last"])
+        switcher = make_switcher({"kimi": primary, "kimi25": backup, "openrouter": last})
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda p=prompt: results.append(switcher.query(p)))
+            for prompt in ("a", "b")
+        ]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while primary.calls < 2 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        gate.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert results == ["backup", "backup"]
+        assert switcher.current_provider_id == "kimi25"
+        assert last.calls == 0
+
+
+class TestApiKeyRotation:
+    """Tests for rotating API keys within a provider."""
+
+    def test_rotates_key_before_switching_provider(self):
+        """A rate-limited key is swapped for the next one on the same provider."""
+        by_key = {
+            "k1": FakeProvider(error=FakeRateLimit(retry_after="30")),
+            "k2": FakeProvider(chunks=["second key"]),
+        }
+        backup = FakeProvider(chunks=["backup"])
+        switcher = make_switcher({"kimi": by_key["k1"], "kimi25": backup})
+        switcher.api_keys = {"kimi": ["k1", "k2"]}
+        switcher._get_or_create_provider = (
+            lambda spec: by_key[switcher._current_api_key(spec)] if spec == "kimi" else backup
+        )
+
+        assert switcher.query("hi") == "second key"
+        assert switcher.current_provider_id == "kimi"
+        assert backup.calls == 0
+        assert ("kimi", 0) in switcher.key_cooldowns
+
+    def test_bad_key_falls_back_to_next_provider(self):
+        """A key whose provider cannot be created does not skip provider fallback."""
+        primary = FakeProvider(error=FakeRateLimit(retry_after="30"))
+        backup = FakeProvider(chunks=["backup"])
+        switcher = make_switcher({"kimi": primary, "kimi25": backup})
+        switcher.api_keys = {"kimi": ["k1", "bad"]}
+
+        def create(spec):
+            if spec == "kimi" and switcher._current_api_key(spec) == "bad":
+                raise ValueError("invalid API key")
+            return switcher.providers[spec]
+
+        switcher._get_or_create_provider = create
+
+        assert switcher.query("hi") == "backup"
+        assert switcher.providers["kimi"] is primary
+        assert switcher.key_indices["kimi"] == 0
+
+    def test_falls_back_when_all_keys_cooling_down(self):
+        """Only when every key is rate-limited does the next provider take over."""
+        limited = FakeProvider(error=FakeRateLimit(retry_after="30"))
+        backup = FakeProvider(chunks=["backup"])
+        switcher = make_switcher({"kimi": limited, "kimi25": backup})
+        switcher.api_keys = {"kimi": ["k1", "k2"]}
+        switcher._get_or_create_provider = lambda spec: limited if spec == "kimi" else backup
+
+        assert switcher.query("hi") == "backup"
+        assert limited.calls == 2
+
+    def test_discover_api_keys(self, monkeypatch):
+        """Unnumbered key first, numbered keys in numeric order."""
+        monkeypatch.setenv("MOONSHOT_API_KEY_10", "ten")
+        monkeypatch.setenv("MOONSHOT_API_KEY_2", "two")
+        monkeypatch.setenv("MOONSHOT_API_KEY", "base")
+        assert ProviderSwitcher._discover_api_keys("MOONSHOT") == ["base", "two", "ten"]
+
+
+class TestInflightCoalescing:
+    """Tests for sharing identical concurrent requests."""
+
+    def _run_concurrently(self, switcher, gate, call):
+        """Run two calls, releasing the provider only once the second has joined."""
+        joined = threading.Event()
+        join_inflight = switcher._join_inflight
+
+        def spy(key):
+            future, is_owner = join_inflight(key)
+            if not is_owner:
+                joined.set()
+            return future, is_owner
+
+        switcher._join_inflight = spy
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(call())) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        joined.wait(timeout=5)
+        gate.set()
+        for thread in threads:
+            thread.join(timeout=5)
+        return results
+
+    def test_identical_queries_share_one_call(self):
+        """A query issued while an identical one is running reuses its result."""
+        gate = threading.Event()
+        provider = FakeProvider(chunks=["answer"], gate=gate)
+        switcher = make_switcher({"kimi": provider})
+
+        results = self._run_concurrently(switcher, gate, lambda: switcher.query("hi"))
+
+        assert results == ["answer", "answer"]
+        assert provider.calls == 1
+        assert switcher._inflight == {}
+
+    def test_different_prompts_are_not_shared(self):
+        """Only identical requests are coalesced."""
+        provider = FakeProvider(chunks=["answer"])
+        switcher = make_switcher({"kimi": provider})
+
+        switcher.query("a")
+        switcher.query("b")
+        assert provider.calls == 2
+
+    def test_waiters_receive_owner_error(self):
+        """A failure of the shared request reaches every caller."""
+        gate = threading.Event()
+        provider = FakeProvider(error=FakeRateLimit("429"), gate=gate)
+        switcher = make_switcher({"kimi": provider})
+
+        def call():
+            try:
+                return switcher.query("hi")
+            except RuntimeError as e:
+                return type(e)
+
+        results = self._run_concurrently(switcher, gate, call)
+        assert results == [RuntimeError, RuntimeError]
+        assert provider.calls == 1
+
+    def test_waiter_sends_own_query_when_owner_stalls(self, monkeypatch):
+        """A caller stops waiting on a stuck request and queries on its own."""
+        monkeypatch.setattr("utils.provider_switcher.INFLIGHT_WAIT_TIMEOUT", 0.01)
+        provider = FakeProvider(chunks=["answer"])
+        switcher = make_switcher({"kimi": provider})
+        key = ("hi", "You are a helpful assistant.", 1024, 0.7)
+        stalled, _ = switcher._join_inflight(key)
+
+        assert switcher.query("hi", system_prompt="You are a helpful assistant.") == "answer"
+        assert provider.calls == 1
+        assert switcher._inflight == {}
+        assert not stalled.done()
+
+    def test_closed_stream_resolves_waiters(self):
+        """Closing the owner's stream early still settles the shared future."""
+        provider = FakeProvider(chunks=["a", "b"])
+        switcher = make_switcher({"kimi": provider})
+
+        stream = switcher.query_stream("hi")
+        assert next(stream) == "a"
+        (future,) = switcher._inflight.values()
+        stream.close()
+
+        assert switcher._inflight == {}
+        with pytest.raises(RuntimeError, match="closed before completion"):
+            future.result(timeout=1)
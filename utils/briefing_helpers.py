@@ -0,0 +1,467 @@
+"""
+Briefing UI Helper Functions
+
+Streamlit-free helpers used by app.py for:
+- Parsing articles out of briefing markdown
+- Building the LLM briefing context
+- Rendering article cards and search results
+- Splitting and throttling markdown output
+"""
+
+import html
+import re
+import time
+from functools import lru_cache
+from collections import defaultdict
+from typing import List, Dict, Any, Iterator, Optional, Set
+
+
+# Numbered bold text ("**1. Title**"); unanchored so the engine can scan for the
+# literal "**" prefix, line-start checks are done on the few hits
+_HEADER_RE = re.compile(r'\*\*\d[^\n]*')
+# "**来源**: value" metadata line
+_SOURCE_RE = re.compile(r'^[ \t]*\*\*来源[^:：\n]*[:：][ \t]*([^\n]*)', re.M)
+# "**URL**: value" or "URL: value" metadata line
+_URL_RE = re.compile(r'URL(?:\*\*)?[:：][ \t]*([^\n]*)')
+# First line that is neither bold metadata nor a URL line
+_SUMMARY_RE = re.compile(r'^(?![ \t]*\*\*)(?![^\n]*URL[:：])[ \t]*(\S[^\n]*)', re.M)
+# Latin/digit words and CJK runs for the local search index
+_TOKEN_RE = re.compile(r'[a-z0-9]+|[\u4e00-\u9fff]+')
+# Separators between search terms (ASCII/full-width commas, 、, whitespace)
+_TERM_SPLIT = re.compile(r'[\s,，、]+')
+# Filler and question words that say nothing about which article is meant
+_STOPWORDS = frozenset("""
+    about all and any are article articles biggest brief briefing can could did
+    does each for from give has have how into its key latest main most news
+    overview please point points recap show stories story summarise summarize
+    summary tell than that the their them there these this those top was week
+    weekly were what when where which who why will with would you your
+""".split()) | frozenset([
+    "文章", "本周", "总结", "所有", "每篇", "什么", "哪些", "新闻", "最新",
+    "主要", "一下", "这些", "简报", "概述", "要点", "重点", "如何", "为什么",
+])
+# YYYYMMDD stamp in a briefing filename (ai_briefing_20260106, product_briefing_20260122, ...)
+_BRIEFING_DATE_RE = re.compile(r'(?<!\d)(\d{8})(?!\d)')
+# Inline markdown kept in article cards: `code`, [text](http url), **bold**, *italic*
+_INLINE_MD_RE = re.compile(
+    r'`([^`\n]+)`|\[([^\]\n]+)\]\((https?://[^\s)]+)\)|\*\*([^*\n]+)\*\*|\*([^*\n]+)\*'
+)
+
+
+def parse_articles_from_markdown(content: str) -> List[Dict[str, str]]:
+    """Parse articles from markdown briefing content"""
+    articles = []
+
+    # (line start, match) for numbered bold lines; indented ones end an
+    # article but do not start one
+    headers = []
+    for match in _HEADER_RE.finditer(content):
+        line_start = content.rfind('\n', 0, match.start()) + 1
+        if not content[line_start:match.start()].strip(' \t'):
+            headers.append((line_start, match))
+
+    for n, (line_start, header) in enumerate(headers):
+        if line_start != header.start():
+            continue
+        line = header.group(0)
+
+        # Title line: "**1. Title**" - drop asterisks and the number prefix
+        title_raw = line.strip('*').strip()
+        if '. ' not in title_raw:
+            continue
+        title = title_raw.split('. ', 1)[1].strip()
+        if not title:
+            continue
+
+        # Body runs until the next numbered bold line
+        end = headers[n + 1][0] if n + 1 < len(headers) else len(content)
+        body = content[header.end():end]
+        source = _SOURCE_RE.search(body)
+        url = _URL_RE.search(body)
+        summary = _SUMMARY_RE.search(body)
+
+        articles.append({
+            "title": title,
+            "summary": summary.group(1).strip()[:200] if summary else "无摘要",
+            "url": url.group(1).strip() if url else "",
+            "source": source.group(1).strip() if source else ""
+        })
+
+    return articles
+
+
+def briefing_sort_key(stem: str) -> tuple:
+    """
+    Sort key for briefing files: the date stamped in the name, then the name
+
+    Sorting on the name alone orders product_/investing_ files ahead of
+    newer ai_briefing_ ones. Names without a date sort oldest.
+    """
+    dates = _BRIEFING_DATE_RE.findall(stem)
+    return (dates[-1] if dates else "", stem)
+
+
+def split_markdown_blocks(content: str) -> List[str]:
+    """
+    Split markdown into blank-line separated blocks
+
+    Each block can be emitted as its own element so Streamlit only
+    re-renders the blocks that changed. Blank lines inside fenced code
+    are kept.
+    """
+    blocks = []
+    current = []
+    in_fence = False
+
+    for line in content.split('\n'):
+        if line.lstrip().startswith('```'):
+            in_fence = not in_fence
+        if not line.strip() and not in_fence:
+            if current:
+                blocks.append('\n'.join(current))
+                current = []
+            continue
+        current.append(line)
+
+    if current:
+        blocks.append('\n'.join(current))
+    return blocks
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase search tokens
+
+    Latin words and numbers are kept whole; CJK runs are split into
+    characters and overlapping bigrams so Chinese matches without a
+    segmenter.
+    """
+    tokens = []
+    for run in _TOKEN_RE.findall(text.lower()):
+        if len(run) > 1 and '\u4e00' <= run[0] <= '\u9fff':
+            tokens.extend(run)
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def build_article_index(articles: List[Dict[str, str]]) -> Dict[str, Set[int]]:
+    """Build an inverted index (token -> article positions) over titles and summaries"""
+    index = defaultdict(set)
+    for i, article in enumerate(articles):
+        for token in tokenize(f"{article.get('title', '')} {article.get('summary', '')}"):
+            index[token].add(i)
+    return dict(index)
+
+
+def search_articles_local(query: str, index: Dict[str, Set[int]]) -> List[int]:
+    """
+    Find articles matching a query in an index from build_article_index
+
+    Terms separated by spaces, commas or 、 are alternatives; an article
+    matches a term when it contains all of the term's tokens. Results are
+    ranked by the number of matched terms, then by briefing order.
+
+    Returns:
+        Article positions, best match first
+    """
+    scores = defaultdict(int)
+    for term in _TERM_SPLIT.split(query):
+        tokens = tokenize(term)
+        if not tokens:
+            continue
+        postings = [index.get(token, set()) for token in tokens]
+        for i in set.intersection(*postings):
+            scores[i] += 1
+
+    return sorted(scores, key=lambda i: (-scores[i], i))
+
+
+def _is_content_token(token: str) -> bool:
+    """Whether a query token can single out articles (not filler or a fragment)"""
+    if token in _STOPWORDS:
+        return False
+    if '\u4e00' <= token[0] <= '\u9fff':
+        # Single characters are kept in the index only to back up the bigrams
+        return len(token) > 1
+    return len(token) > 2
+
+
+def select_relevant_articles(query: str, index: Dict[str, Set[int]], k: int = 3) -> Optional[List[int]]:
+    """
+    Pick the top-k article positions for a query from the local index
+
+    Stopwords and short tokens are ignored, so broad questions ("summarize
+    all articles", "biggest AI stories") do not narrow the context. The
+    query is only narrowed when the top-k hits score strictly higher than
+    every other match.
+
+    Returns:
+        Positions of the best matches, or None when there is no clear match
+        (the caller should then send the whole briefing)
+    """
+    scores = defaultdict(int)
+    for term in _TERM_SPLIT.split(query):
+        tokens = [token for token in tokenize(term) if _is_content_token(token)]
+        if not tokens:
+            continue
+        postings = [index.get(token, set()) for token in tokens]
+        for i in set.intersection(*postings):
+            scores[i] += 1
+
+    hits = sorted(scores, key=lambda i: (-scores[i], i))
+    if not hits:
+        return None
+    if len(hits) > k and scores[hits[k - 1]] == scores[hits[k]]:
+        # The cut-off would split equally good matches
+        return None
+    return hits[:k]
+
+
+# Closing instructions appended to every briefing context
+_CONTEXT_FOOTER = (
+    "\n---\n\n"
+    "使用说明:\n"
+    "- 分析文章时，请参考完整内容\n"
+    "- 找出每篇文章的中心论点（central argument）\n"
+    "- 指出支撑论点的数据和证据（data and evidence）\n"
+    "- 如果用户要求，可以从URL获取完整文章进行更深入分析"
+)
+
+
+def _render_context_article(idx: int, article: Dict[str, str]) -> str:
+    """Render one article of the LLM context as a markdown section"""
+    title = article.get('title', 'Untitled')
+    summary = article.get('summary')
+    source = article.get('source')
+    url = article.get('url')
+
+    text = f"## {idx}. {title}\n\n"
+    if summary:
+        text += f"{summary}\n\n"
+    if source and url:
+        text += f"来源: {source} | URL: {url}\n\n"
+    elif source:
+        text += f"来源: {source}\n\n"
+    elif url:
+        text += f"URL: {url}\n\n"
+    return text
+
+
+def create_enriched_briefing_context(
+    articles: List[Dict[str, str]],
+    focus: Optional[List[int]] = None
+) -> str:
+    """
+    Create enriched context for LLM with full article information
+    Includes article summaries, sources, URLs, and explanations
+
+    When focus positions are given, only those articles are included in
+    full; the rest are listed by title to keep the prompt short.
+    """
+    if not articles:
+        return "No articles available."
+
+    if focus is None:
+        body = "".join(_render_context_article(idx, article) for idx, article in enumerate(articles, 1))
+        return f"# 本周精选文章\n\n{body}{_CONTEXT_FOOTER}"
+
+    focus_set = set(focus)
+    sections = []
+    other_titles = []
+    for idx, article in enumerate(articles, 1):
+        if idx - 1 in focus_set:
+            sections.append(_render_context_article(idx, article))
+        else:
+            other_titles.append(f"- {idx}. {article.get('title', 'Untitled')}\n")
+
+    others = f"## 本周其他文章（仅标题）\n{''.join(other_titles)}\n" if other_titles else ""
+    return f"# 本周精选文章\n\n{''.join(sections)}{others}{_CONTEXT_FOOTER}"
+
+
+# System prompts for LLM search and Q&A; the briefing context is appended
+SEARCH_SYSTEM_PROMPT = """你是一位AI行业搜索专家。用户需要找到与其查询相关的文章。
+
+搜索要求:
+1. 找到所有与用户查询相关的文章
+2. 对每篇匹配的文章进行详细分析
+3. 说明为什么这篇文章与查询相关
+4. 提供具体的证据或摘录支持您的判断
+
+返回格式（对每篇匹配的文章）:
+**[文章标题]**
+来源: [来源]
+URL: [链接]
+相关度: [高/中/低]
+相关原因: [简要说明这篇文章为什么与查询相关，包括具体的数据或证据]
+
+重要提示:
+- 如果找不到相关文章，明确说明
+- 不要编造不存在的文章
+- 使用中文回答
+- 深入分析而不仅仅返回标题
+
+以下是本周的文章内容:
+
+"""
+
+ANSWER_SYSTEM_PROMPT = """你是一位AI行业分析专家。你需要回答关于AI行业周报的问题。
+
+关键职责:
+1. 分析文章内容，提取中心论点（Central Argument）
+2. 识别并解释支撑论点的数据和证据（Data and Evidence）
+3. 如果用户提问含混，应该提供多角度的分析
+4. 引用具体的文章标题和来源
+5. 深入分析而非仅重复摘要
+
+回答要求:
+- 准确引用文章内容
+- 提供具体的数据、数字或事实
+- 解释因果关系和逻辑
+- 必要时可以从多篇文章综合分析
+- 使用中文回答，保持专业且易懂的语气
+
+以下是本周的文章内容:
+
+"""
+
+
+# Article fields read by format_multi_week_results; search results carry only these
+RESULT_FIELDS = ["title", "source", "url", "credibility_score"]
+
+
+@lru_cache(maxsize=1024)
+def render_result_article(title: str, source: str, url: str, score: Any, lang: str) -> str:
+    """
+    Render one search-result article as markdown
+
+    Output depends only on the arguments, so results are memoized and
+    repeated searches over the same archive skip the string building.
+    """
+    parts = [f"**{title}**"]
+
+    meta_parts = []
+    if source:
+        meta_parts.append(f"来源: {source}" if lang == "zh" else f"Source: {source}")
+    if url:
+        meta_parts.append(f"[URL]({url})")
+    if meta_parts:
+        parts.append(" | ".join(meta_parts))
+
+    if score:
+        parts.append(f"可信度: {score}/10" if lang == "zh" else f"Credibility: {score}/10")
+
+    parts.append("")
+    return "\n".join(parts)
+
+
+def inline_markdown_to_html(text: str) -> str:
+    """
+    Convert inline markdown (code, links, bold, italic) to HTML
+
+    Everything outside those constructs is HTML-escaped, and links are
+    only emitted for http(s) URLs.
+    """
+    parts = []
+    pos = 0
+    for match in _INLINE_MD_RE.finditer(text):
+        parts.append(html.escape(text[pos:match.start()]))
+        code, link_text, link_url, bold, italic = match.groups()
+        if code is not None:
+            parts.append(f"<code>{html.escape(code)}</code>")
+        elif link_text is not None:
+            parts.append(
+                f"<a href='{html.escape(link_url, quote=True)}' target='_blank'>{html.escape(link_text)}</a>"
+            )
+        elif bold is not None:
+            parts.append(f"<strong>{html.escape(bold)}</strong>")
+        else:
+            parts.append(f"<em>{html.escape(italic)}</em>")
+        pos = match.end()
+    parts.append(html.escape(text[pos:]))
+    return "".join(parts)
+
+
+@lru_cache(maxsize=1024)
+def render_article_card_html(idx: int, title: str, summary: str, source: str, url: str) -> str:
+    """
+    Render one briefing article as a single HTML card
+
+    One element per article instead of separate title/summary/meta/divider
+    elements keeps the number of components sent per rerun low. Inline
+    markdown in the title and summary is kept (see inline_markdown_to_html).
+    """
+    parts = [f"<div class='article-card'><div class='article-title'>{idx}. {inline_markdown_to_html(title)}</div>"]
+
+    if summary:
+        parts.append(f"<div class='article-summary'>{inline_markdown_to_html(summary)}</div>")
+
+    meta_parts = []
+    if source:
+        meta_parts.append(f"来源: {html.escape(source)}")
+    if url:
+        safe_url = html.escape(url, quote=True)
+        meta_parts.append(f"<a class='article-url' href='{safe_url}' target='_blank'>{safe_url}</a>")
+    if meta_parts:
+        parts.append(f"<div class='article-meta'>{' | '.join(meta_parts)}</div>")
+
+    parts.append("</div>")
+    return "".join(parts)
+
+
+def format_multi_week_results(results: List[Dict[str, Any]], lang: str = "zh") -> str:
+    """
+    Format multi-week search results for display
+
+    Args:
+        results: List of articles from ContextRetriever
+        lang: Language for display (zh/en)
+
+    Returns:
+        Formatted markdown string
+    """
+    if not results:
+        return "没有找到匹配的文章。" if lang == "zh" else "No articles found."
+
+    output_lines = []
+    output_lines.append(f"## 找到 {len(results)} 篇相关文章\n" if lang == "zh" else f"## Found {len(results)} relevant articles\n")
+
+    # Group by date
+    by_date = {}
+    for article in results:
+        date = article.get("report_date", "Unknown")
+        if date not in by_date:
+            by_date[date] = []
+        by_date[date].append(article)
+
+    # Display grouped by date
+    for date in sorted(by_date.keys(), reverse=True):
+        output_lines.append(f"### 📅 {date}")
+        output_lines.append("")
+
+        for article in by_date[date]:
+            output_lines.append(render_result_article(
+                article.get('title', 'Untitled'),
+                article.get('source', ''),
+                article.get('url', ''),
+                article.get('credibility_score'),
+                lang
+            ))
+
+    return "\n".join(output_lines)
+
+
+def throttle_stream(chunks: Iterator[str], interval: float = 0.05) -> Iterator[str]:
+    """Coalesce streamed chunks so the UI redraws at most once per interval"""
+    buffer = []
+    last_flush = time.monotonic()
+    for chunk in chunks:
+        buffer.append(chunk)
+        now = time.monotonic()
+        if now - last_flush >= interval:
+            yield "".join(buffer)
+            buffer = []
+            last_flush = now
+    if buffer:
+        yield "".join(buffer)
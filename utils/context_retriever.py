@@ -6,11 +6,21 @@ Provides simple search and filtering capabilities across cached articles.
 """
 
 import json
+import re
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from loguru import logger
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Separators between keyword search terms (ASCII/full-width commas, 、, whitespace)
+_TERM_SPLIT = re.compile(r"[\s,，、]+")
+
 
 class ContextRetriever:
     """Retrieves cached article contexts from storage"""
@@ -27,6 +37,15 @@ class ContextRetriever:
             logger.warning(f"Cache directory does not exist: {cache_dir}")
             self.cache_dir.mkdir(parents=True, exist_ok=True)
 
+        # Parsed cache files keyed by path, invalidated on mtime
+        self._report_cache: Dict[Path, Tuple[float, Dict[str, Any]]] = {}
+
+        # Per-report search blobs, keyed by (date, fields) and invalidated on mtime
+        self._keyword_index: Dict[Tuple[str, Tuple[str, ...]], Tuple[float, List[Tuple[Dict[str, Any], str]]]] = {}
+
+        # Per-report entity blobs by entity type, keyed by date and invalidated on mtime
+        self._entity_index: Dict[str, Tuple[float, List[Tuple[Dict[str, Any], Dict[str, str]]]]] = {}
+
     def list_available_reports(self) -> List[Dict[str, Any]]:
         """
         List all available cached reports
@@ -50,8 +69,7 @@ class ContextRetriever:
                 file_date = datetime.strptime(cache_file.stem, "%Y%m%d")
 
                 # Load metadata
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = self._read_report(cache_file)
 
                 reports.append({
                     "date": file_date.strftime("%Y-%m-%d"),
@@ -90,8 +108,7 @@ class ContextRetriever:
                 logger.warning(f"No cached report found for date: {date}")
                 return None
 
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = self._read_report(cache_path)
 
             logger.info(f"Loaded report from {date} with {len(data.get('articles', []))} articles")
             return data
@@ -103,6 +120,29 @@ class ContextRetriever:
             logger.error(f"Failed to load report for {date}: {e}")
             return None
 
+    def _read_report(self, cache_path: Path) -> Dict[str, Any]:
+        """
+        Parse a cached report file, memoized on its mtime
+
+        Uses orjson when installed. The returned dict is shared between
+        callers and must not be mutated.
+
+        Args:
+            cache_path: Path to the report JSON file
+
+        Returns:
+            Parsed report data
+        """
+        mtime = cache_path.stat().st_mtime
+        cached = self._report_cache.get(cache_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        raw = cache_path.read_bytes()
+        data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw.decode('utf-8'))
+        self._report_cache[cache_path] = (mtime, data)
+        return data
+
     def load_latest_report(self) -> Optional[Dict[str, Any]]:
         """
         Load the most recent cached report
@@ -110,13 +150,25 @@ class ContextRetriever:
         Returns:
             Full report data, or None if no reports exist
         """
-        reports = self.list_available_reports()
-        if not reports:
+        # Single pass over filenames; no need to parse every report
+        latest_stem = max(
+            (f.stem for f in self.cache_dir.glob("*.json") if self._is_date_stem(f.stem)),
+            default=None
+        )
+        if latest_stem is None:
             logger.warning("No cached reports found")
             return None
 
-        latest_date = reports[0]["date"]
-        return self.load_report_by_date(latest_date)
+        return self.load_report_by_date(latest_stem)
+
+    @staticmethod
+    def _is_date_stem(stem: str) -> bool:
+        """Check whether a cache filename stem is a YYYYMMDD date"""
+        try:
+            datetime.strptime(stem, "%Y%m%d")
+            return True
+        except ValueError:
+            return False
 
     def get_article_by_id(self, date: str, article_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -146,24 +198,35 @@ class ContextRetriever:
         keyword: str,
         date_from: Optional[str] = None,
         date_to: Optional[str] = None,
-        search_fields: List[str] = None
+        search_fields: List[str] = None,
+        fields: Optional[List[str]] = None
     ) -> List[Dict[str, Any]]:
         """
         Search cached articles by keyword
 
         Args:
-            keyword: Search term (case-insensitive)
+            keyword: Search term (case-insensitive); terms separated by spaces,
+                commas or 、 match if any of them appears
             date_from: Start date (YYYY-MM-DD) - optional
             date_to: End date (YYYY-MM-DD) - optional
             search_fields: Fields to search in (default: ["title", "full_content"])
+            fields: Article fields to return - optional (default: all fields)
 
         Returns:
             List of matching articles with metadata
         """
         if search_fields is None:
             search_fields = ["title", "full_content"]
-
-        keyword_lower = keyword.lower()
+        search_fields = tuple(search_fields)
+
+        # Multi-term queries compile to one alternation so each blob is scanned once
+        terms = [term for term in _TERM_SPLIT.split(keyword.lower()) if term]
+        if len(terms) > 1:
+            pattern = re.compile("|".join(map(re.escape, terms)))
+            matches = lambda blob: pattern.search(blob) is not None
+        else:
+            keyword_lower = terms[0] if terms else ""
+            matches = lambda blob: keyword_lower in blob
         results = []
 
         # Get date range
@@ -178,35 +241,76 @@ class ContextRetriever:
             if date_to and report_date > date_to:
                 continue
 
-            # Load report
-            report = self.load_report_by_date(report_date)
-            if not report:
-                continue
-
-            # Search articles
-            for article in report.get("articles", []):
-                # Check if keyword matches any search field
-                match = False
-                for field in search_fields:
-                    field_value = str(article.get(field, "")).lower()
-                    if keyword_lower in field_value:
-                        match = True
-                        break
-
-                if match:
-                    # Add report metadata
-                    article["report_date"] = report_date
-                    results.append(article)
+            # Match against precomputed lowercase blobs (one scan per article)
+            for article, blob in self._get_keyword_index(report_date, search_fields):
+                if matches(blob):
+                    # Copy so cached articles are not mutated
+                    match = self._project(article, fields)
+                    match["report_date"] = report_date
+                    results.append(match)
 
         logger.info(f"Found {len(results)} articles matching '{keyword}'")
         return results
 
+    @staticmethod
+    def _project(article: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+        """Copy an article, keeping only the requested fields if given"""
+        if fields is None:
+            return dict(article)
+        return {field: article[field] for field in fields if field in article}
+
+    def _get_keyword_index(
+        self,
+        report_date: str,
+        search_fields: Tuple[str, ...]
+    ) -> List[Tuple[Dict[str, Any], str]]:
+        """
+        Get (article, lowercase search blob) pairs for a cached report
+
+        The blob joins the searched fields with a separator that cannot
+        appear in a query, so repeated searches cost a single substring
+        check per article instead of re-lowering every field. Entries are
+        rebuilt when the cache file's mtime changes.
+
+        Args:
+            report_date: Report date (YYYY-MM-DD)
+            search_fields: Article fields to include in the blob
+
+        Returns:
+            List of (article, blob) tuples, empty if the report is missing
+        """
+        cache_path = self.cache_dir / f"{report_date.replace('-', '')}.json"
+        try:
+            mtime = cache_path.stat().st_mtime
+        except OSError:
+            return []
+
+        key = (report_date, search_fields)
+        cached = self._keyword_index.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        report = self.load_report_by_date(report_date)
+        if not report:
+            return []
+
+        entries = [
+            (
+                article,
+                "\x01".join(str(article.get(field, "")).lower() for field in search_fields)
+            )
+            for article in report.get("articles", [])
+        ]
+        self._keyword_index[key] = (mtime, entries)
+        return entries
+
     def search_by_entity(
         self,
         entity_name: str,
         entity_type: Optional[str] = None,
         date_from: Optional[str] = None,
-        date_to: Optional[str] = None
+        date_to: Optional[str] = None,
+        fields: Optional[List[str]] = None
     ) -> List[Dict[str, Any]]:
         """
         Search cached articles by entity
@@ -216,6 +320,7 @@ class ContextRetriever:
             entity_type: Optional entity type filter (companies, models, people, locations, other)
             date_from: Start date (YYYY-MM-DD) - optional
             date_to: End date (YYYY-MM-DD) - optional
+            fields: Article fields to return - optional (default: all fields)
 
         Returns:
             List of matching articles
@@ -235,34 +340,69 @@ class ContextRetriever:
             if date_to and report_date > date_to:
                 continue
 
-            # Load report
-            report = self.load_report_by_date(report_date)
-            if not report:
-                continue
-
-            # Search articles
-            for article in report.get("articles", []):
-                entities = article.get("entities", {})
-
-                # If entity_type specified, search only that type
+            # Match against precomputed per-type entity blobs
+            for article, blobs in self._get_entity_index(report_date):
                 if entity_type:
-                    entity_list = entities.get(entity_type, [])
-                    if any(entity_lower in e.lower() for e in entity_list):
-                        article["report_date"] = report_date
-                        article["matched_entity_type"] = entity_type
-                        results.append(article)
+                    blob = blobs.get(entity_type)
+                    matched_type = entity_type if blob is not None and entity_lower in blob else None
                 else:
-                    # Search all entity types
-                    for etype, elist in entities.items():
-                        if any(entity_lower in e.lower() for e in elist):
-                            article["report_date"] = report_date
-                            article["matched_entity_type"] = etype
-                            results.append(article)
-                            break  # Avoid duplicates
+                    # First matching type wins to avoid duplicates
+                    matched_type = next(
+                        (etype for etype, blob in blobs.items() if entity_lower in blob),
+                        None
+                    )
+
+                if matched_type:
+                    match = self._project(article, fields)
+                    match["report_date"] = report_date
+                    match["matched_entity_type"] = matched_type
+                    results.append(match)
 
         logger.info(f"Found {len(results)} articles mentioning entity '{entity_name}'")
         return results
 
+    def _get_entity_index(self, report_date: str) -> List[Tuple[Dict[str, Any], Dict[str, str]]]:
+        """
+        Get (article, {entity_type: lowercase blob}) pairs for a cached report
+
+        Each entity list is lowered and joined once, so an entity search is
+        one substring check per type instead of a loop over every entity.
+        Entries are rebuilt when the cache file's mtime changes.
+
+        Args:
+            report_date: Report date (YYYY-MM-DD)
+
+        Returns:
+            List of (article, blobs) tuples, empty if the report is missing
+        """
+        cache_path = self.cache_dir / f"{report_date.replace('-', '')}.json"
+        try:
+            mtime = cache_path.stat().st_mtime
+        except OSError:
+            return []
+
+        cached = self._entity_index.get(report_date)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        report = self.load_report_by_date(report_date)
+        if not report:
+            return []
+
+        entries = [
+            (
+                article,
+                {
+                    etype: "\x01".join(str(e).lower() for e in elist)
+                    for etype, elist in (article.get("entities") or {}).items()
+                    if elist
+                }
+            )
+            for article in report.get("articles", [])
+        ]
+        self._entity_index[report_date] = (mtime, entries)
+        return entries
+
     def get_article_statistics(self, date: str) -> Dict[str, Any]:
         """
         Get statistics for a cached report
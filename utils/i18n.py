@@ -0,0 +1,162 @@
+"""
+UI Translations
+
+English and Mandarin Chinese UI text for the Streamlit app. Kept out of
+app.py so the tables are built once per process instead of on every
+script rerun.
+"""
+
+TRANSLATIONS = {
+    "page_title": {
+        "en": "AI Industry Weekly Briefing",
+        "zh": "AI行业周报"
+    },
+    "subtitle": {
+        "en": "Executive Summary & Insights",
+        "zh": "高管摘要与洞察"
+    },
+    "mode_search": {
+        "en": "Search",
+        "zh": "搜索"
+    },
+    "mode_ask": {
+        "en": "Ask Question",
+        "zh": "提问"
+    },
+    "unified_input_search": {
+        "en": "Search articles...",
+        "zh": "搜索文章..."
+    },
+    "unified_input_ask": {
+        "en": "Ask a question about the briefing...",
+        "zh": "提问关于简报..."
+    },
+    "search_help": {
+        "en": "Company/Model/Topic search powered by LLM",
+        "zh": "由LLM驱动的公司/模型/主题搜索"
+    },
+    "about_brief": {
+        "en": "ℹ️ About This Brief",
+        "zh": "ℹ️ 关于此简报"
+    },
+    "about_description": {
+        "en": "This briefing features the top 10 AI industry articles this week, selected by impact and novelty.",
+        "zh": "此简报展示本周按影响和新颖性选择的前10篇AI行业文章。"
+    },
+    "report_date": {
+        "en": "Report Date",
+        "zh": "报告日期"
+    },
+    "last_updated": {
+        "en": "Last Updated",
+        "zh": "最后更新"
+    },
+    "articles": {
+        "en": "Articles",
+        "zh": "文章"
+    },
+    "page": {
+        "en": "Page",
+        "zh": "页"
+    },
+    "executive_summary": {
+        "en": "📊 Executive Summary",
+        "zh": "📊 高管摘要"
+    },
+    "language": {
+        "en": "🌐 Language",
+        "zh": "🌐 语言"
+    },
+    "download": {
+        "en": "⬇️ Download as Markdown",
+        "zh": "⬇️ 下载Markdown"
+    },
+    "briefing": {
+        "en": "Briefing",
+        "zh": "简报"
+    },
+    "download_tab": {
+        "en": "Download",
+        "zh": "下载"
+    },
+    "chat_error": {
+        "en": "Error answering question",
+        "zh": "回答问题时出错"
+    },
+    "search_results_title": {
+        "en": "📄 Search Results",
+        "zh": "📄 搜索结果"
+    },
+    "no_results": {
+        "en": "No articles matched your search",
+        "zh": "没有文章与您的搜索匹配"
+    },
+    "deep_analysis": {
+        "en": "Deep analysis (AI)",
+        "zh": "深度分析（AI）"
+    },
+    "local_results_hint": {
+        "en": "Keyword matches from this week's briefing. Turn on deep analysis for an AI answer.",
+        "zh": "本周简报的关键词匹配结果。开启深度分析可获取AI解读。"
+    },
+    "ai_response": {
+        "en": "💬 AI Response",
+        "zh": "💬 AI回复"
+    },
+    "your_question": {
+        "en": "You",
+        "zh": "你"
+    },
+    "ai_assistant": {
+        "en": "Assistant",
+        "zh": "助手"
+    },
+    "multi_week_search": {
+        "en": "Multi-Week Search",
+        "zh": "多周搜索"
+    },
+    "entity_search": {
+        "en": "Entity Search",
+        "zh": "实体搜索"
+    },
+    "date_range": {
+        "en": "Date Range",
+        "zh": "日期范围"
+    },
+    "entity_type": {
+        "en": "Entity Type",
+        "zh": "实体类型"
+    },
+    "companies": {
+        "en": "Companies/Models",
+        "zh": "公司/模型"
+    },
+    "people": {
+        "en": "People",
+        "zh": "人物"
+    },
+    "locations": {
+        "en": "Locations",
+        "zh": "地点"
+    },
+    "other": {
+        "en": "Other",
+        "zh": "其他"
+    },
+}
+
+
+# Flattened once at import so t() is a single dict lookup
+_TRANSLATIONS_FLAT = {
+    (key, lang): text for key, entry in TRANSLATIONS.items() for lang, text in entry.items()
+}
+_TRANSLATIONS_EN = {key: entry["en"] for key, entry in TRANSLATIONS.items() if "en" in entry}
+
+
+def t(key: str, lang: str = "en", **kwargs) -> str:
+    """Get translated text, falling back to English, then the key"""
+    try:
+        text = _TRANSLATIONS_FLAT[key, lang]
+    except KeyError:
+        text = _TRANSLATIONS_EN.get(key, key)
+    return text.format(**kwargs) if kwargs else text
@@ -8,7 +8,7 @@ with automatic fallback and rate limit handling.
 import os
 import json
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterator
 from openai import OpenAI, RateLimitError, APIConnectionError, APIError
 from loguru import logger
 
@@ -90,6 +90,87 @@ class BaseLLMProvider(ABC):
         """
         pass
 
+    def chat_stream(
+        self,
+        system_prompt: str,
+        user_message: str,
+        model: Optional[str] = None,
+        temperature: float = 0.3,
+        max_tokens: int = 4096
+    ) -> Iterator[str]:
+        """
+        Send a chat request and yield the response as text chunks
+
+        Default implementation for providers without streaming support:
+        yields the full chat() response as a single chunk.
+
+        Args:
+            system_prompt: System instruction
+            user_message: User message
+            model: Model to use (overrides default)
+            temperature: Temperature for generation
+            max_tokens: Maximum tokens in response
+
+        Yields:
+            Response text chunks
+        """
+        content, _ = self.chat(
+            system_prompt=system_prompt,
+            user_message=user_message,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        yield content
+
+    def _stream_completion(
+        self,
+        system_prompt: str,
+        user_message: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        **extra: Any
+    ) -> Iterator[str]:
+        """Stream an OpenAI-compatible chat completion, yielding content deltas"""
+        try:
+            self.stats["total_calls"] += 1
+
+            stream = self.client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_message}
+                ],
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True,
+                **extra
+            )
+
+            for chunk in stream:
+                if chunk.choices:
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yield delta
+
+            self.stats["successful_calls"] += 1
+            self.last_error = None
+            self.is_available = True
+
+        except RateLimitError as e:
+            self.stats["rate_limit_errors"] += 1
+            self.stats["failed_calls"] += 1
+            self.last_error = e
+            logger.warning(f"{self.provider_id} rate limit hit: {e}")
+            raise
+
+        except Exception as e:
+            self.stats["failed_calls"] += 1
+            self.last_error = e
+            logger.error(f"{self.provider_id} streaming error: {e}")
+            raise
+
     def detect_rate_limit(self, error: Exception) -> bool:
         """
         Detect if error is a rate limit or fallback-triggering error.
@@ -216,6 +297,23 @@ class KimiProvider(BaseLLMProvider):
             logger.error(f"Kimi API error: {e}")
             raise
 
+    def chat_stream(
+        self,
+        system_prompt: str,
+        user_message: str,
+        model: Optional[str] = None,
+        temperature: float = 0.3,
+        max_tokens: int = 4096
+    ) -> Iterator[str]:
+        """Stream a chat response from Kimi"""
+        return self._stream_completion(
+            system_prompt,
+            user_message,
+            model or self.current_model,
+            temperature,
+            max_tokens
+        )
+
     def _update_stats(self, usage: Dict[str, int], model: str):
         """Update usage statistics"""
         input_tokens = usage.get("prompt_tokens", 0)
@@ -326,6 +424,27 @@ class OpenRouterProvider(BaseLLMProvider):
             logger.error(f"OpenRouter API error: {e}")
             raise
 
+    def chat_stream(
+        self,
+        system_prompt: str,
+        user_message: str,
+        model: Optional[str] = None,
+        temperature: float = 0.3,
+        max_tokens: int = 4096
+    ) -> Iterator[str]:
+        """Stream a chat response from OpenRouter"""
+        return self._stream_completion(
+            system_prompt,
+            user_message,
+            model or self.current_model,
+            temperature,
+            max_tokens,
+            extra_headers={
+                "HTTP-Referer": "https://github.com/dragonsun/briefAI",
+                "X-Title": "AI Industry Weekly Briefing Agent"
+            }
+        )
+
     def _update_stats(self, usage: Dict[str, int], model: str):
         """Update usage statistics"""
         input_tokens = usage.get("prompt_tokens", 0)
@@ -361,6 +480,7 @@ class Kimi25Provider(BaseLLMProvider):
         self.is_available = True
         self.last_error = None
         self.client = None  # Not using OpenAI SDK
+        self._session = None  # Pooled requests.Session, created on first call
 
         self.stats = {
             "total_calls": 0,
@@ -377,6 +497,13 @@ class Kimi25Provider(BaseLLMProvider):
     def get_pricing(self, model: str) -> Dict[str, float]:
         return {"input": 0.0, "output": 0.0}  # Included with subscription
 
+    def _get_session(self):
+        """Reuse one HTTP session so calls share pooled TLS connections."""
+        if self._session is None:
+            import requests as _requests
+            self._session = _requests.Session()
+        return self._session
+
     def chat(
         self,
         system_prompt: str,
@@ -386,8 +513,6 @@ class Kimi25Provider(BaseLLMProvider):
         max_tokens: int = 4096,
     ) -> tuple[str, Dict[str, int]]:
         """Send a chat request via Anthropic-compatible messages API."""
-        import requests as _requests
-
         model = model or self.current_model
         self.stats["total_calls"] += 1
 
@@ -408,7 +533,7 @@ class Kimi25Provider(BaseLLMProvider):
             payload["temperature"] = temperature
 
         try:
-            resp = _requests.post(
+            resp = self._get_session().post(
                 f"{self.base_url}/messages",
                 headers=headers,
                 json=payload,
@@ -6,7 +6,12 @@ Implements quality-first strategy with graceful degradation.
 """
 
 import json
-from typing import Optional, Dict, Any, List, Tuple
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Optional, Dict, Any, List, Tuple, Iterator
 from pathlib import Path
 from loguru import logger
 from dotenv import load_dotenv
@@ -16,6 +21,25 @@ load_dotenv()
 
 from utils.llm_provider import BaseLLMProvider, KimiProvider, Kimi25Provider, OpenRouterProvider
 
+# Cooldown applied to a rate-limited provider when the error carries no hint
+DEFAULT_RATE_LIMIT_COOLDOWN = 60.0
+# Consecutive server/transport failures that open a provider's circuit breaker
+CIRCUIT_BREAKER_THRESHOLD = 3
+CIRCUIT_BREAKER_COOLDOWN = 60.0
+# Cooldown applied to a provider abandoned after a timeout
+TIMEOUT_COOLDOWN = 60.0
+# Longest a caller waits on an identical in-flight request before sending its own
+INFLIGHT_WAIT_TIMEOUT = 120.0
+
+# "please try again in 12.5s" style hints in rate-limit error bodies
+_RETRY_IN_RE = re.compile(r'try again in\s+(\d+(?:\.\d+)?)\s*s', re.IGNORECASE)
+# HTTP 5xx status quoted in an error message ("502 Bad Gateway", "Error code: 503")
+_SERVER_STATUS_RE = re.compile(
+    r'(?:error code|status(?: code)?|http)\W*5\d\d\b'
+    r'|\b5\d\d\s+(?:internal|bad gateway|service unavailable|gateway timeout|server)',
+    re.IGNORECASE
+)
+
 
 class ProviderSwitcher:
     """Manages provider switching and fallback logic"""
@@ -42,7 +66,6 @@ class ProviderSwitcher:
         }
 
         # Load OpenRouter API keys for rotation
-        import os
         self.openrouter_keys = []
         for i in [1, 2, 3]:
             key_name = "OPENROUTER_API_KEY" if i == 1 else f"OPENROUTER_API_KEY_{i}"
@@ -51,6 +74,29 @@ class ProviderSwitcher:
                 self.openrouter_keys.append(key)
 
         self.current_key_index = 0
+
+        # Kimi API keys (NAME_API_KEY, NAME_API_KEY_2, ...) rotated on rate
+        # limits before falling back to another provider
+        self.api_keys: Dict[str, List[str]] = {
+            'kimi25': self._discover_api_keys('KIMI25'),
+            'kimi': self._discover_api_keys('MOONSHOT'),
+        }
+        self.key_indices: Dict[str, int] = {}
+        self.key_cooldowns: Dict[Tuple[str, int], float] = {}
+
+        # Provider spec -> time.monotonic() until which it is skipped, and
+        # consecutive failure counts feeding the circuit breaker
+        self.cooldowns: Dict[str, float] = {}
+        self.failure_counts: Dict[str, int] = {}
+
+        # Guards the selection state above (current provider, cooldowns, key
+        # and model rotation): one switcher is shared by every app session
+        self._state_lock = threading.RLock()
+
+        # Identical requests already in flight, shared by concurrent callers
+        self._inflight: Dict[Tuple, Future] = {}
+        self._inflight_lock = threading.Lock()
+
         if self.openrouter_keys:
             logger.info(f"Loaded {len(self.openrouter_keys)} OpenRouter API keys for rotation")
 
@@ -121,7 +167,7 @@ class ProviderSwitcher:
         if provider_spec == 'kimi25':
             if provider_spec in self.providers:
                 return self.providers[provider_spec]
-            provider = Kimi25Provider()
+            provider = Kimi25Provider(api_key=self._current_api_key(provider_spec))
             self.providers[provider_spec] = provider
             return provider
 
@@ -129,7 +175,7 @@ class ProviderSwitcher:
         if provider_spec == 'kimi':
             if provider_spec in self.providers:
                 return self.providers[provider_spec]
-            provider = KimiProvider()
+            provider = KimiProvider(api_key=self._current_api_key(provider_spec))
             self.providers[provider_spec] = provider
             return provider
 
@@ -160,6 +206,73 @@ class ProviderSwitcher:
         else:
             raise ValueError(f"Unknown provider spec: {provider_spec}")
 
+    @staticmethod
+    def _discover_api_keys(prefix: str) -> List[str]:
+        """
+        Find PREFIX_API_KEY and numbered PREFIX_API_KEY_N variables
+
+        Returns:
+            Key values, the unnumbered key first and the rest by number
+        """
+        pattern = re.compile(rf'^{prefix}_API_KEY(?:_(\d+))?$')
+        found = []
+        for name, value in os.environ.items():
+            match = pattern.match(name)
+            if match and value:
+                found.append((int(match.group(1) or 0), value))
+        return [value for _, value in sorted(found)]
+
+    def _current_api_key(self, provider_spec: str) -> Optional[str]:
+        """Get the API key currently selected for a provider (None uses its default)"""
+        keys = self.api_keys.get(provider_spec) or []
+        if not keys:
+            return None
+        return keys[self.key_indices.get(provider_spec, 0) % len(keys)]
+
+    def _rotate_api_key(self, provider_spec: str, cooldown: float) -> Optional[BaseLLMProvider]:
+        """
+        Cool down the current API key and switch to the provider's next free key
+
+        Args:
+            provider_spec: Provider whose key hit a rate limit
+            cooldown: Seconds before the rate-limited key may be used again
+
+        Returns:
+            Provider instance using the new key, or None if no other key is free
+        """
+        with self._state_lock:
+            keys = self.api_keys.get(provider_spec) or []
+            if len(keys) < 2:
+                return None
+
+            now = time.monotonic()
+            current = self.key_indices.get(provider_spec, 0)
+            self.key_cooldowns[(provider_spec, current)] = now + cooldown
+
+            for step in range(1, len(keys)):
+                index = (current + step) % len(keys)
+                if self.key_cooldowns.get((provider_spec, index), 0.0) > now:
+                    continue
+
+                self.key_indices[provider_spec] = index
+                old_provider = self.providers.pop(provider_spec, None)
+                try:
+                    provider = self._get_or_create_provider(provider_spec)
+                except Exception as e:
+                    # Keep the old key's provider; the caller falls back to the next provider
+                    logger.warning(f"Failed to create {provider_spec} with API key {index + 1}: {e}")
+                    self.key_indices[provider_spec] = current
+                    if old_provider is not None:
+                        self.providers[provider_spec] = old_provider
+                    return None
+                if old_provider is not None:
+                    provider.stats = old_provider.stats
+                self.current_provider = provider
+                logger.info(f"Rotated {provider_spec} to API key {index + 1}/{len(keys)}")
+                return provider
+
+            return None
+
     def _get_rotated_api_key(self) -> Optional[str]:
         """
         Get current API key and rotate to next one for future calls.
@@ -238,12 +351,13 @@ class ProviderSwitcher:
         Returns:
             New provider instance
         """
-        provider = self._get_or_create_provider(provider_spec)
-        self.current_provider = provider
-        self.current_provider_id = provider_spec
+        with self._state_lock:
+            provider = self._get_or_create_provider(provider_spec)
+            self.current_provider = provider
+            self.current_provider_id = provider_spec
 
-        logger.info(f"Switched provider to: {provider_spec}")
-        return provider
+            logger.info(f"Switched provider to: {provider_spec}")
+            return provider
 
     def switch_to_next_provider(self) -> Optional[BaseLLMProvider]:
         """
@@ -253,51 +367,55 @@ class ProviderSwitcher:
         Returns:
             New provider instance or None if all providers exhausted
         """
-        current_index = -1
-        try:
-            current_index = self.provider_queue.index(self.current_provider_id)
-        except ValueError:
+        with self._state_lock:
             current_index = -1
-
-        # Try next providers in queue
-        for i in range(current_index + 1, len(self.provider_queue)):
-            provider_spec = self.provider_queue[i]
-
-            # Extract tier name to show current model
-            tier = None
-            if provider_spec.startswith('openrouter.'):
-                tier = provider_spec.split('.')[1]
-
             try:
-                provider = self._get_or_create_provider(provider_spec)
-                self.current_provider = provider
-                self.current_provider_id = provider_spec
-
-                # Determine provider name and current model for logging
-                provider_name = self._get_provider_display_name(provider_spec)
-
-                openrouter_config = self._get_openrouter_config()
-                if tier and tier in self.tier_model_indices and openrouter_config:
-                    current_model_idx = (self.tier_model_indices[tier] - 1) % len(
-                        openrouter_config['tiers'][tier]['models']
-                    )
-                    model_name = openrouter_config['tiers'][tier]['models'][
-                        current_model_idx
-                    ]
-                    logger.info(
-                        f"Switched to fallback provider: {provider_name} "
-                        f"(using model: {model_name})"
-                    )
-                else:
-                    logger.info(f"Switched to fallback provider: {provider_name}")
+                current_index = self.provider_queue.index(self.current_provider_id)
+            except ValueError:
+                current_index = -1
+
+            # Try next providers in queue
+            for i in range(current_index + 1, len(self.provider_queue)):
+                provider_spec = self.provider_queue[i]
+                if self._in_cooldown(provider_spec):
+                    logger.debug(f"Skipping {provider_spec}: cooling down")
+                    continue
+
+                # Extract tier name to show current model
+                tier = None
+                if provider_spec.startswith('openrouter.'):
+                    tier = provider_spec.split('.')[1]
+
+                try:
+                    provider = self._get_or_create_provider(provider_spec)
+                    self.current_provider = provider
+                    self.current_provider_id = provider_spec
+
+                    # Determine provider name and current model for logging
+                    provider_name = self._get_provider_display_name(provider_spec)
 
-                return provider
-            except Exception as e:
-                logger.warning(f"Failed to create provider {provider_spec}: {e}")
-                continue
+                    openrouter_config = self._get_openrouter_config()
+                    if tier and tier in self.tier_model_indices and openrouter_config:
+                        current_model_idx = (self.tier_model_indices[tier] - 1) % len(
+                            openrouter_config['tiers'][tier]['models']
+                        )
+                        model_name = openrouter_config['tiers'][tier]['models'][
+                            current_model_idx
+                        ]
+                        logger.info(
+                            f"Switched to fallback provider: {provider_name} "
+                            f"(using model: {model_name})"
+                        )
+                    else:
+                        logger.info(f"Switched to fallback provider: {provider_name}")
 
-        logger.error("All providers and models exhausted!")
-        return None
+                    return provider
+                except Exception as e:
+                    logger.warning(f"Failed to create provider {provider_spec}: {e}")
+                    continue
+
+            logger.error("All providers and models exhausted!")
+            return None
 
     def _get_openrouter_config(self) -> Optional[Dict[str, Any]]:
         """Get the OpenRouter provider config by ID"""
@@ -320,6 +438,105 @@ class ProviderSwitcher:
             return 'OpenRouter Tier 3 (Fast)'
         return provider_spec
 
+    def _in_cooldown(self, provider_spec: str) -> bool:
+        """Check whether a provider is still rate-limited or circuit-broken"""
+        with self._state_lock:
+            until = self.cooldowns.get(provider_spec)
+            if until is None:
+                return False
+            if time.monotonic() >= until:
+                # The switcher is shared process-wide; another session may have
+                # cleared the same expired entry already
+                self.cooldowns.pop(provider_spec, None)
+                return False
+            return True
+
+    def _start_cooldown(self, provider_spec: str, seconds: float) -> None:
+        """Skip a provider for the given number of seconds"""
+        with self._state_lock:
+            self.cooldowns[provider_spec] = time.monotonic() + seconds
+            logger.info(f"Cooling down {provider_spec} for {seconds:.0f}s")
+
+    @staticmethod
+    def _parse_retry_after(error: Exception) -> float:
+        """
+        Extract the server's retry hint from a rate-limit error
+
+        Reads the Retry-After header when the error carries a response,
+        then falls back to "try again in Xs" in the message body.
+        """
+        response = getattr(error, 'response', None)
+        headers = getattr(response, 'headers', None) or {}
+        try:
+            retry_after = headers.get('retry-after')
+        except Exception:
+            retry_after = None
+        if retry_after:
+            try:
+                return max(float(retry_after), 1.0)
+            except (TypeError, ValueError):
+                pass
+
+        match = _RETRY_IN_RE.search(str(error))
+        if match:
+            return max(float(match.group(1)), 1.0)
+        return DEFAULT_RATE_LIMIT_COOLDOWN
+
+    @staticmethod
+    def _is_server_failure(error: Exception) -> bool:
+        """
+        Check whether an error is a server or transport failure (5xx,
+        connection error, timeout) rather than a problem with the request
+
+        Only these count toward the circuit breaker; auth and validation
+        errors or bugs say nothing about the provider's health.
+        """
+        status = getattr(error, 'status_code', None)
+        if status is None:
+            status = getattr(getattr(error, 'response', None), 'status_code', None)
+        if isinstance(status, int):
+            return status >= 500
+
+        if isinstance(error, (ConnectionError, TimeoutError)):
+            return True
+        name = type(error).__name__.lower()
+        if "connection" in name or "timeout" in name:
+            return True
+
+        message = str(error).lower()
+        return (
+            "timeout" in message
+            or "timed out" in message
+            or "connection" in message
+            or bool(_SERVER_STATUS_RE.search(message))
+        )
+
+    def _restore_preferred_provider(self) -> None:
+        """
+        Move back to the first higher-priority provider whose cooldown has expired
+
+        Only providers that were benched with a cooldown are restored, so a
+        provider skipped for another reason is not retried on every call.
+        """
+        with self._state_lock:
+            try:
+                current_index = self.provider_queue.index(self.current_provider_id)
+            except ValueError:
+                current_index = len(self.provider_queue)
+
+            now = time.monotonic()
+            for provider_spec in self.provider_queue[:current_index]:
+                until = self.cooldowns.get(provider_spec)
+                if until is None or until > now:
+                    continue
+                try:
+                    self.switch_provider(provider_spec)
+                except Exception as e:
+                    logger.warning(f"Failed to restore provider {provider_spec}: {e}")
+                    continue
+                self.cooldowns.pop(provider_spec, None)
+                return
+
     def retry_with_fallback(
         self,
         task_name: str,
@@ -343,80 +560,110 @@ class ProviderSwitcher:
         """
         max_retries = 5  # More retries to allow model rotation
 
+        # Return to a higher-priority provider once its cooldown is over
+        self._restore_preferred_provider()
+
         for attempt in range(max_retries):
-            try:
+            # Snapshot under the lock: the switcher is shared by every session
+            with self._state_lock:
                 provider = self.current_provider
-                provider_name = self._get_provider_display_name(
-                    self.current_provider_id
-                )
+                provider_id = self.current_provider_id
+            provider_name = self._get_provider_display_name(provider_id)
 
+            try:
                 logger.debug(f"[{task_name}] Attempt {attempt + 1} with {provider_name}")
 
                 # Execute callback with current provider
                 result = callback(provider, *args, **kwargs)
 
                 logger.debug(f"[{task_name}] Success with {provider_name}")
-                return result, self.current_provider_id
+                with self._state_lock:
+                    self.failure_counts.pop(provider_id, None)
+                return result, provider_id
 
             except Exception as e:
-                logger.warning(f"[{task_name}] {self.current_provider_id} error: {e}")
-
-                # Check if it's a rate limit error
-                if self.current_provider.detect_rate_limit(e):
-                    # Extract current tier to see if we can rotate models within it
-                    current_tier = None
-                    if self.current_provider_id.startswith('openrouter.'):
-                        current_tier = self.current_provider_id.split('.')[1]
-
-                    logger.warning(
-                        f"[{task_name}] Rate limit hit on "
-                        f"{self._get_provider_display_name(self.current_provider_id)}, "
-                        f"trying next model/provider..."
-                    )
-
-                    # If we're in an OpenRouter tier, try next model in same tier first
-                    openrouter_config = self._get_openrouter_config()
-                    if current_tier and current_tier in self.tier_model_indices and openrouter_config:
-                        tier_models = openrouter_config['tiers'][current_tier]['models']
-                        current_idx = (self.tier_model_indices[current_tier] - 1) % len(tier_models)
-                        models_in_tier = len(tier_models)
-
-                        # If we haven't tried all models in this tier, try next model
-                        if models_in_tier > 1:
-                            logger.debug(
-                                f"[{task_name}] Trying next model in {current_tier}..."
-                            )
-                            # Create new provider with next model in same tier
-                            provider = self._get_or_create_provider(
-                                f"openrouter.{current_tier}"
-                            )
-                            self.current_provider = provider
-                            continue
+                logger.warning(f"[{task_name}] {provider_id} error: {e}")
 
-                    # Otherwise, move to next tier/provider
-                    next_provider = self.switch_to_next_provider()
-                    if next_provider:
+                with self._state_lock:
+                    if self.current_provider is not provider:
+                        # Another session already moved off this provider; retry on its pick
                         continue
-                    else:
-                        logger.error(f"[{task_name}] All providers and models exhausted!")
-                        raise RuntimeError("All LLM providers exhausted")
-                else:
-                    # Check if it's a timeout — switch provider, don't retry same one
-                    err_str = str(e).lower()
-                    is_timeout = "timeout" in err_str or "timed out" in err_str
-                    if is_timeout:
-                        logger.warning(f"[{task_name}] Timeout on {self.current_provider_id}, switching provider...")
+
+                    # Check if it's a rate limit error
+                    if self.current_provider.detect_rate_limit(e):
+                        # Extract current tier to see if we can rotate models within it
+                        current_tier = None
+                        if self.current_provider_id.startswith('openrouter.'):
+                            current_tier = self.current_provider_id.split('.')[1]
+
+                        logger.warning(
+                            f"[{task_name}] Rate limit hit on "
+                            f"{self._get_provider_display_name(self.current_provider_id)}, "
+                            f"trying next model/provider..."
+                        )
+
+                        # Another API key for the same provider keeps quality and cost unchanged
+                        retry_after = self._parse_retry_after(e)
+                        if self._rotate_api_key(self.current_provider_id, retry_after):
+                            continue
+
+                        # If we're in an OpenRouter tier, try next model in same tier first
+                        openrouter_config = self._get_openrouter_config()
+                        if current_tier and current_tier in self.tier_model_indices and openrouter_config:
+                            tier_models = openrouter_config['tiers'][current_tier]['models']
+                            current_idx = (self.tier_model_indices[current_tier] - 1) % len(tier_models)
+                            models_in_tier = len(tier_models)
+
+                            # If we haven't tried all models in this tier, try next model
+                            if models_in_tier > 1:
+                                logger.debug(
+                                    f"[{task_name}] Trying next model in {current_tier}..."
+                                )
+                                # Create new provider with next model in same tier
+                                provider = self._get_or_create_provider(
+                                    f"openrouter.{current_tier}"
+                                )
+                                self.current_provider = provider
+                                continue
+
+                        # Otherwise, skip this provider until the server says it can be
+                        # retried and move to next tier/provider immediately (no sleep)
+                        self._start_cooldown(self.current_provider_id, retry_after)
                         next_provider = self.switch_to_next_provider()
                         if next_provider:
                             continue
-                        # No more providers — fall through to retry
-                    # Other errors - retry with same provider
-                    if attempt < max_retries - 1:
-                        logger.warning(f"[{task_name}] Retrying with same provider...")
-                        continue
+                        else:
+                            logger.error(f"[{task_name}] All providers and models exhausted!")
+                            raise RuntimeError("All LLM providers exhausted")
                     else:
-                        logger.error(f"[{task_name}] Max retries exceeded")
-                        raise
+                        # Circuit breaker: repeated server failures take the provider out for a while
+                        if self._is_server_failure(e):
+                            failures = self.failure_counts.get(self.current_provider_id, 0) + 1
+                            self.failure_counts[self.current_provider_id] = failures
+                            if failures >= CIRCUIT_BREAKER_THRESHOLD:
+                                self.failure_counts.pop(self.current_provider_id, None)
+                                self._start_cooldown(self.current_provider_id, CIRCUIT_BREAKER_COOLDOWN)
+                                if self.switch_to_next_provider():
+                                    continue
+
+                        # Check if it's a timeout — switch provider, don't retry same one
+                        err_str = str(e).lower()
+                        is_timeout = "timeout" in err_str or "timed out" in err_str
+                        if is_timeout:
+                            logger.warning(f"[{task_name}] Timeout on {self.current_provider_id}, switching provider...")
+                            # Bench it so later queries stay on the fallback until it may have recovered
+                            self._start_cooldown(self.current_provider_id, TIMEOUT_COOLDOWN)
+                            next_provider = self.switch_to_next_provider()
+                            if next_provider:
+                                continue
+                            # No more providers — fall through to retry
+                        # Other errors - retry with same provider
+                        if attempt < max_retries - 1:
+                            logger.warning(f"[{task_name}] Retrying with same provider...")
+                            continue
+                        else:
+                            logger.error(f"[{task_name}] Max retries exceeded")
+                            raise
 
         raise RuntimeError(f"Failed to complete task: {task_name}")
 
@@ -502,9 +749,142 @@ class ProviderSwitcher:
             )
             return response
 
-        # Execute with automatic fallback
-        result, provider_used = self.retry_with_fallback(
-            task_name="LLM Query",
-            callback=_query_callback
-        )
+        def _run_query() -> str:
+            """Execute with automatic fallback"""
+            result, provider_used = self.retry_with_fallback(
+                task_name="LLM Query",
+                callback=_query_callback
+            )
+            return result
+
+        # Identical concurrent queries wait for the first one's result
+        key = (prompt, system_prompt, max_tokens, temperature)
+        future, is_owner = self._join_inflight(key)
+        if not is_owner:
+            logger.debug("Joining in-flight LLM query")
+            try:
+                return future.result(timeout=INFLIGHT_WAIT_TIMEOUT)
+            except FutureTimeoutError:
+                self._drop_inflight(key, future)
+                return _run_query()
+
+        try:
+            result = _run_query()
+        except Exception as e:
+            self._finish_inflight(key, future, error=e)
+            raise
+
+        self._finish_inflight(key, future, result=result)
         return result
+
+    def query_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 1024,
+        temperature: float = 0.7
+    ) -> Iterator[str]:
+        """
+        Execute a query and yield the response as it is generated.
+
+        Fallback applies until the first chunk arrives; errors after that
+        propagate to the caller since partial output was already yielded.
+
+        Args:
+            prompt: The user's input prompt
+            system_prompt: Optional system prompt for context
+            max_tokens: Maximum tokens in response
+            temperature: Temperature for response generation (0-1)
+
+        Yields:
+            Response text chunks
+
+        Raises:
+            RuntimeError: If all providers are exhausted
+        """
+        def _open_stream_callback(provider: BaseLLMProvider):
+            """Callback to open a stream and pull its first chunk"""
+            system = system_prompt or "You are a helpful AI assistant."
+            stream = provider.chat_stream(
+                system_prompt=system,
+                user_message=prompt,
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+            return next(stream, ""), stream
+
+        def _run_stream() -> Iterator[str]:
+            """Open the stream with automatic fallback and yield its chunks"""
+            (first_chunk, stream), provider_used = self.retry_with_fallback(
+                task_name="LLM Stream",
+                callback=_open_stream_callback
+            )
+            if first_chunk:
+                yield first_chunk
+            yield from stream
+
+        # Identical concurrent requests get the first stream's full text
+        key = (prompt, system_prompt, max_tokens, temperature)
+        future, is_owner = self._join_inflight(key)
+        if not is_owner:
+            logger.debug("Joining in-flight LLM stream")
+            try:
+                result = future.result(timeout=INFLIGHT_WAIT_TIMEOUT)
+            except FutureTimeoutError:
+                # The owner's session may have gone away without closing its stream
+                self._drop_inflight(key, future)
+                yield from _run_stream()
+                return
+            yield result
+            return
+
+        chunks = []
+        try:
+            for chunk in _run_stream():
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            self._finish_inflight(key, future, error=e)
+            raise
+        else:
+            self._finish_inflight(key, future, result="".join(chunks))
+        finally:
+            # Closed early (GeneratorExit) or abandoned by a rerun: never leave waiters hanging
+            if not future.done():
+                self._finish_inflight(key, future, error=RuntimeError("LLM stream closed before completion"))
+
+    def _join_inflight(self, key: Tuple) -> Tuple[Future, bool]:
+        """
+        Register a request, or join an identical one already in flight
+
+        Returns:
+            Tuple of (future, is_owner); only the owner performs the request
+            and must resolve the future via _finish_inflight
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+
+    def _drop_inflight(self, key: Tuple, future: Future) -> None:
+        """Unregister a request so later callers stop joining it"""
+        with self._inflight_lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def _finish_inflight(
+        self,
+        key: Tuple,
+        future: Future,
+        result: Optional[str] = None,
+        error: Optional[BaseException] = None
+    ) -> None:
+        """Unregister an owned request and hand its outcome to waiting callers"""
+        self._drop_inflight(key, future)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
@@ -0,0 +1,98 @@
+"""
+App Styling
+
+Static stylesheet for the Streamlit app, defined once per process.
+"""
+
+import re
+
+import streamlit as st
+
+
+CSS = """
+    <style>
+    .main-title {
+        font-size: 2.5em;
+        font-weight: bold;
+        margin-bottom: 0.3em;
+        color: #1f77b4;
+    }
+    .subtitle-text {
+        font-size: 1.1em;
+        color: #555;
+        margin-bottom: 1em;
+    }
+    .article-card {
+        background-color: #f0f2f6;
+        padding: 1.2em;
+        border-radius: 0.5em;
+        margin: 0.8em 0;
+        border-left: 4px solid #1f77b4;
+    }
+    .article-title {
+        font-size: 1.1em;
+        font-weight: bold;
+        color: #1f77b4;
+        margin-bottom: 0.5em;
+    }
+    .article-meta {
+        font-size: 0.85em;
+        color: #666;
+        margin-bottom: 0.5em;
+    }
+    .article-summary {
+        font-size: 0.95em;
+        line-height: 1.5;
+        color: #333;
+    }
+    .article-url {
+        font-size: 0.85em;
+        color: #1f77b4;
+        text-decoration: none;
+    }
+    .chat-message {
+        padding: 1em;
+        border-radius: 0.5em;
+        margin: 0.8em 0;
+    }
+    .chat-user {
+        background-color: #e8f4f8;
+        margin-left: 1em;
+    }
+    .chat-ai {
+        background-color: #f0f0f0;
+        margin-right: 1em;
+    }
+    .search-result-item {
+        background-color: #fafafa;
+        padding: 1em;
+        margin: 0.5em 0;
+        border-left: 3px solid #1f77b4;
+        border-radius: 0.3em;
+    }
+    .relevance-score {
+        display: inline-block;
+        background-color: #1f77b4;
+        color: white;
+        padding: 0.2em 0.5em;
+        border-radius: 0.25em;
+        font-size: 0.85em;
+        margin-top: 0.5em;
+    }
+    </style>
+"""
+
+# Whitespace-collapsed copy sent to the browser on every rerun
+_CSS_MIN = re.sub(r'\s*([{}:;,])\s*', r'\1', re.sub(r'\s+', ' ', CSS)).strip()
+
+
+def inject_css() -> None:
+    """
+    Emit the stylesheet
+
+    Call on every rerun: elements that are not re-emitted are removed by
+    Streamlit, so the stylesheet cannot be emitted once and cached. The
+    minified copy keeps the per-rerun payload small, and st.html skips the
+    frontend markdown parser (style-only HTML takes no space in the layout).
+    """
+    st.html(_CSS_MIN)
@@ -201,11 +201,10 @@ class TrendAggregator:
             if not report:
                 continue
 
-            # Add all articles from this report
+            # Add all articles from this report (copied: cached reports are shared)
             report_articles = report.get("articles", [])
             for article in report_articles:
-                article["report_date"] = report_date
-                articles.append(article)
+                articles.append({**article, "report_date": report_date})
 
         return articles
 